@@ -0,0 +1,20 @@
+"""Pytest configuration shared by the test modules."""
+# pyright: basic
+
+from __future__ import annotations
+
+import pathlib
+import sys
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+
+# fan-daemon.py is not an importable name, so load it once per session under
+# "fan_daemon" (by absolute path, independent of the cwd). SourceFileLoader
+# reads and writes __pycache__/fan-daemon.*.pyc like a normal import.
+_path = pathlib.Path(__file__).with_name("fan-daemon.py")
+_spec = spec_from_loader("fan_daemon", SourceFileLoader("fan_daemon", str(_path)))
+assert _spec is not None
+_module = module_from_spec(_spec)
+sys.modules["fan_daemon"] = _module
+assert _spec.loader is not None
+_spec.loader.exec_module(_module)
@@ -25,11 +25,14 @@ Dependencies:
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import dataclasses
+import functools
 import logging
 import re
 import signal
 import sys
+import threading
 import time
 from typing import Protocol, cast, final
 
@@ -44,6 +47,14 @@ log = logging.getLogger("fan-daemon")
 MappingPoint = tuple[float, float, float | None, float | None]
 MappingKey = tuple[str, int, int]  # (device_type, device_idx, zone); -1 means "all"
 
+# Mapping spec key, e.g. "gpu0-zone1" -> ("gpu", "0", "1")
+_SPEC_KEY_RE = re.compile(r"^([a-z][a-z_]*)(\d+)?(?:-zone(\d+)?)?$")
+
+# ipmitool raw fan zone get/set commands; zone and duty bytes are appended
+_SET_SPEED_PREFIX = ("raw", "0x30", "0x70", "0x66", "0x01")
+_GET_SPEED_PREFIX = ("raw", "0x30", "0x70", "0x66", "0x00")
+_HEX = tuple(f"0x{i:02x}" for i in range(256))  # Byte -> ipmitool hex arg
+
 
 class Hardware(Protocol):
     """Hardware interface protocol."""
@@ -52,7 +63,9 @@ class Hardware(Protocol):
     def get_temps(self) -> dict[str, tuple[int, ...] | None] | None: ...
     def get_zones(self) -> tuple[int, ...]: ...
     def set_zone_speed(self, zone: int, percent: int) -> bool: ...
+    def set_zone_speeds(self, speeds: dict[int, int]) -> bool: ...
     def set_fail_safe(self) -> bool: ...
+    def close(self) -> None: ...
 
 
 @final
@@ -68,6 +81,16 @@ class SupermicroH13:
         ipmi_ready_timeout_seconds: float = 120.0
         ipmi_ready_retry_seconds: float = 5.0
         ipmi_temps: bool = False  # Use ipmitool for RAM/VRM temps
+        # Skip BMC writes that change a zone by less than this (0 = always write)
+        speed_deadband_percent: int = 2
+        # Without pynvml, stream nvidia-smi samples at this period (0 = fork
+        # nvidia-smi on every read)
+        nvidia_smi_loop_ms: int = 1000
+
+        # Reuse any sensor's last reading for this long, so back-to-back
+        # get_temps() calls (e.g. startup check then first tick) read once.
+        # Sensors with a min_interval_seconds attribute use that instead.
+        sensor_min_interval_seconds: float = 1.0
 
         # IPMI sensor name -> result_key
         # Keys that duplicate other sensors get _ipmi suffix
@@ -118,17 +141,29 @@ class SupermicroH13:
 
     def __init__(self, config: Config):
         self.config = config
-        self._last_set_speeds: dict[int, int] = {}
+        # Last speed written per zone, indexed by zone id (None = unknown)
+        self._last_set_speeds: list[int | None] = [None] * (
+            max(config.zones, default=-1) + 1
+        )
 
         # Initialize sensors (detection happens in constructors)
         self._sensors: list[sensors.Sensor] = [
             sensors.K10Temp(),
-            sensors.Nvidiasmi(),
+            sensors.gpu_sensor(config.nvidia_smi_loop_ms),
             sensors.Smartctl(),
             sensors.Nvmecli(),
         ]
         if config.ipmi_temps:
             self._sensors.append(sensors.Ipmitool(config.ipmi_sensors))
+        # Sensors are independent and mostly wait on subprocesses or the BMC,
+        # so read them concurrently; a tick costs the slowest read, not the sum
+        self._sensor_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(self._sensors), thread_name_prefix="sensor"
+        )
+        # sensor -> (monotonic read time, result) for interval-limited sensors
+        self._sensor_cache: dict[
+            sensors.Sensor, tuple[float, sensors.SensorResult]
+        ] = {}
 
     def initialize(self) -> bool:
         """Initialize hardware for manual fan control. Sets BMC to full mode.
@@ -155,12 +190,17 @@ class SupermicroH13:
         """Get all temperatures. Returns None on critical failure."""
         result: dict[str, tuple[int, ...] | None] = {}
 
-        for sensor in self._sensors:
-            sensor_result = sensor.get()
+        now = time.monotonic()
+
+        def read(sensor: sensors.Sensor) -> sensors.SensorResult:
+            return self._read_sensor(sensor, now)
+
+        sensor_results = self._sensor_pool.map(read, self._sensors)
+        for sensor_result in sensor_results:  # In self._sensors order
             for key, temps in sensor_result.items():
                 if temps is not None:
-                    # Convert floats to ints
-                    result[key] = tuple(int(t) for t in temps)
+                    # Convert floats to ints (map runs the loop in C)
+                    result[key] = tuple(map(int, temps))
                 elif key not in result:
                     result[key] = None
 
@@ -174,34 +214,103 @@ class SupermicroH13:
 
         return result
 
+    def _read_sensor(
+        self,
+        sensor: sensors.Sensor,
+        now: float,
+    ) -> sensors.SensorResult:
+        """Read sensor, reusing its last result within its minimum interval."""
+        interval: float = getattr(
+            sensor, "min_interval_seconds", self.config.sensor_min_interval_seconds
+        )
+        if interval <= 0:
+            return sensor.get()
+        cached = self._sensor_cache.get(sensor)
+        if cached is not None and now - cached[0] < interval:
+            return cached[1]
+        sensor_result = sensor.get()
+        # Don't hold on to failed reads; retry next tick
+        if any(v is not None for v in sensor_result.values()):
+            self._sensor_cache[sensor] = (now, sensor_result)
+        else:
+            _ = self._sensor_cache.pop(sensor, None)
+        return sensor_result
+
     def get_zones(self) -> tuple[int, ...]:
         """Get available fan zones."""
         return self.config.zones
 
     def set_zone_speed(self, zone: int, percent: int) -> bool:
-        """Set fan zone speed. Skips if already at requested speed."""
-        if self._last_set_speeds.get(zone) == percent:
+        """Set fan zone speed. Skips if already at requested speed.
+
+        Changes smaller than speed_deadband_percent are also skipped (each write
+        costs a BMC round-trip plus ipmi_write_delay_seconds), except that a
+        request for 100% is always honored.
+        """
+        if not self._needs_write(zone, percent):
             return True
         log.debug("IPMI set zone %d to %d%% (0x%02x)", zone, percent, percent)
-        out = run_cmd(
-            [
-                "ipmitool",
-                "raw",
-                "0x30",
-                "0x70",
-                "0x66",
-                "0x01",
-                f"0x{zone:02x}",
-                f"0x{percent:02x}",
-            ]
-        )
+        out = run_cmd(["ipmitool", *self._set_speed_args(zone, percent)])
         if out is None:
             log.error("Failed to set zone %d to %d%%", zone, percent)
             return False
         self._last_set_speeds[zone] = percent
         # Let BMC settle after command
         time.sleep(self.config.ipmi_write_delay_seconds)
-        # Verify read-back in debug mode
+        self._verify_zone_speed(zone, percent)
+        return True
+
+    def set_zone_speeds(self, speeds: dict[int, int]) -> bool:
+        """Set several fan zones, skipping writes as set_zone_speed() does.
+
+        When more than one zone needs a write, the raw commands are batched
+        through one `ipmitool exec` run, costing one process and one settle
+        delay instead of one per zone. exec only reports the status of its
+        last command, so each zone is read back before it is trusted; zones
+        that did not take, or every zone if exec itself fails (e.g. ipmitool
+        built without /dev/stdin access), are written one at a time.
+        """
+        pending = {z: p for z, p in speeds.items() if self._needs_write(z, p)}
+        if len(pending) <= 1:
+            return all(self.set_zone_speed(z, p) for z, p in pending.items())
+        log.debug("IPMI set zones %s", pending)
+        script = "".join(
+            " ".join(self._set_speed_args(zone, percent)) + "\n"
+            for zone, percent in pending.items()
+        )
+        if run_cmd(["ipmitool", "exec", "/dev/stdin"], stdin=script) is None:
+            log.warning("ipmitool exec failed, setting zones one at a time")
+            return all(self.set_zone_speed(z, p) for z, p in pending.items())
+        # Let BMC settle after commands
+        time.sleep(self.config.ipmi_write_delay_seconds)
+        unconfirmed: dict[int, int] = {}
+        for zone, percent in pending.items():
+            if self._get_zone_speed(zone) == percent:
+                self._last_set_speeds[zone] = percent
+            else:
+                unconfirmed[zone] = percent
+        if unconfirmed:
+            log.warning("Batched write not confirmed for zones %s", unconfirmed)
+        return all(self.set_zone_speed(z, p) for z, p in unconfirmed.items())
+
+    def _needs_write(self, zone: int, percent: int) -> bool:
+        """Return False if zone is at percent or within the deadband of it."""
+        last = self._last_set_speeds[zone]
+        if last == percent:
+            return False
+        return (
+            last is None
+            or percent == 100
+            or abs(last - percent) >= self.config.speed_deadband_percent
+        )
+
+    @staticmethod
+    def _set_speed_args(zone: int, percent: int) -> list[str]:
+        """Return ipmitool args (without "ipmitool") that set a zone speed."""
+        return [*_SET_SPEED_PREFIX, _HEX[zone], _HEX[percent]]
+
+    def _verify_zone_speed(self, zone: int, percent: int) -> None:
+        """Verify read-back in debug mode."""
         if log.isEnabledFor(logging.DEBUG):
             actual = self._get_zone_speed(zone)
             if actual is not None and actual != percent:
@@ -211,13 +320,10 @@ class SupermicroH13:
                     percent,
                     actual,
                 )
-        return True
 
     def _get_zone_speed(self, zone: int) -> int | None:
         """Get current fan zone speed from BMC."""
-        out = run_cmd(
-            ["ipmitool", "raw", "0x30", "0x70", "0x66", "0x00", f"0x{zone:02x}"]
-        )
+        out = run_cmd(["ipmitool", *_GET_SPEED_PREFIX, _HEX[zone]])
         if not out:
             return None
         try:
@@ -227,7 +333,7 @@ class SupermicroH13:
 
     def set_fail_safe(self) -> bool:
         """Set BMC to full mode and clear speed cache. Retries until success."""
-        self._last_set_speeds.clear()
+        self._last_set_speeds[:] = [None] * len(self._last_set_speeds)
         deadline = time.time() + self.config.ipmi_ready_timeout_seconds
         while True:
             if self._set_full_mode():
@@ -244,6 +350,10 @@ class SupermicroH13:
             )
             time.sleep(self.config.ipmi_ready_retry_seconds)
 
+    def close(self) -> None:
+        """Release the sensor read threads. Hardware is left as it is."""
+        self._sensor_pool.shutdown(wait=False, cancel_futures=True)
+
     def _set_full_mode(self) -> bool:
         """Ensure BMC is in full/manual fan mode."""
         out = run_cmd(["ipmitool", "raw", "0x30", "0x45", "0x00"])
@@ -408,10 +518,7 @@ class FanSpeed:
             key_part, value_part = spec.split("=", 1)
 
             # Parse key
-            m = re.match(
-                r"^([a-z][a-z_]*)(\d+)?(?:-zone(\d+)?)?$",
-                key_part.strip().lower(),
-            )
+            m = _SPEC_KEY_RE.match(key_part.strip().lower())
             if not m:
                 raise ValueError(f"Invalid mapping key format: {key_part}")
             key: MappingKey = (
@@ -456,6 +563,10 @@ class FanSpeed:
 
     def __init__(self, config: Config):
         self.config = config
+        # (device_type, device_idx, zone) -> get() result; speeds are static
+        self._resolved: dict[
+            MappingKey, tuple[tuple[MappingPoint, ...], MappingKey] | None
+        ] = {}
 
     def get(
         self,
@@ -466,10 +577,17 @@ class FanSpeed:
         """Look up mapping with precedence: deviceN-zoneM > deviceN-zone > device-zoneM > device-zone.
 
         Returns (mapping, matched_key) or None. matched_key shows which key was used,
-        including whether zone was -1 (wildcard).
+        including whether zone was -1 (wildcard). Results are memoized, since the
+        same (device, zone) pairs are resolved every tick.
         """
+        query = (device_type, device_idx, zone)
+        try:
+            return self._resolved[query]
+        except KeyError:
+            pass
+        result = None
         for k in [
-            (device_type, device_idx, zone),
+            query,
             (device_type, device_idx, -1),
             (device_type, -1, zone),
             (device_type, -1, -1),
@@ -477,8 +595,10 @@ class FanSpeed:
             if k in self.config.speeds:
                 mapping = self.config.speeds[k]
                 if mapping is not None:
-                    return mapping, k
-        return None
+                    result = mapping, k
+                    break
+        self._resolved[query] = result
+        return result
 
     def lookup(
         self,
@@ -505,11 +625,17 @@ class FanSpeed:
         if current_time is None:
             current_time = time.time()
 
-        # Find normal threshold (highest t where temp >= t)
+        # Single pass over the (sorted) mapping finds both the normal threshold
+        # (highest t where temp >= t) and the index of the active threshold.
         normal_idx = -1
+        active_idx = -1
         for i, (t, _, _, _) in enumerate(mapping):
             if temp >= t:
                 normal_idx = i
+            elif active_idx >= 0 or active_threshold is None:
+                break  # Past normal threshold and nothing left to find
+            if active_idx < 0 and t == active_threshold:
+                active_idx = i
 
         if normal_idx < 0:
             # Below all thresholds, use first speed
@@ -518,16 +644,6 @@ class FanSpeed:
         normal_thresh = mapping[normal_idx][0]
         normal_speed = mapping[normal_idx][1]
 
-        if active_threshold is None:
-            return normal_speed, normal_thresh, None
-
-        # Find index of active threshold
-        active_idx = -1
-        for i, (t, _, _, _) in enumerate(mapping):
-            if t == active_threshold:
-                active_idx = i
-                break
-
         if active_idx < 0 or normal_idx >= active_idx:
             # Rising or same threshold, use normal (reset drop zone timer)
             return normal_speed, normal_thresh, None
@@ -612,9 +728,11 @@ class FanDaemon:
         self.hardware = hardware
         self.speed = speed
         self.running = False
+        self._stop_event = threading.Event()  # Set by shutdown() to end wait
+        self._zones = tuple(sorted(hardware.get_zones()))  # Static, sort once
         self.active_thresholds: dict[tuple[str, int, int], float] = {}
         self.time_in_drop_zone: dict[tuple[str, int, int], float | None] = {}
-        self.last_logged_speeds: dict[int, int] = {}
+        self.last_logged_speeds: list[int] = []  # Speeds in sorted zone order
         self.last_heartbeat = 0.0
 
     def run(self) -> None:
@@ -622,36 +740,44 @@ class FanDaemon:
         _ = signal.signal(signal.SIGTERM, self.shutdown)
         _ = signal.signal(signal.SIGINT, self.shutdown)
 
-        log.info("Starting: zones=%s", list(self.hardware.get_zones()))
-
-        if not self.hardware.initialize():
-            log.error("Failed to initialize hardware")
-            sys.exit(1)
-
-        # Verify all speed mappings have corresponding sensors
-        temps = self.hardware.get_temps()
-        if temps is None:
-            log.error("Failed to read temps during startup")
-            sys.exit(1)
-        missing = self._check_mappings(temps)
-        if missing:
-            log.error(
-                "Speed mappings reference missing sensors: %s", ", ".join(missing)
-            )
-            log.error("Available sensors: %s", ", ".join(sorted(temps.keys())))
-            sys.exit(1)
-
-        self.running = True
-        while self.running:
-            try:
-                self.control_loop()
-            except Exception:
-                log.exception("Control loop error")
-                _ = self.hardware.set_fail_safe()
+        try:
+            log.info("Starting: zones=%s", list(self.hardware.get_zones()))
+
+            if not self.hardware.initialize():
+                log.error("Failed to initialize hardware")
+                sys.exit(1)
+
+            # Verify all speed mappings have corresponding sensors
+            temps = self.hardware.get_temps()
+            if temps is None:
+                log.error("Failed to read temps during startup")
+                sys.exit(1)
+            missing = self._check_mappings(temps)
+            if missing:
+                log.error(
+                    "Speed mappings reference missing sensors: %s", ", ".join(missing)
+                )
+                log.error("Available sensors: %s", ", ".join(sorted(temps.keys())))
+                sys.exit(1)
+
+            # shutdown() may already have run during startup (initialize() can
+            # wait minutes for the BMC); the event stays set, so go straight to
+            # fail-safe
+            self.running = not self._stop_event.is_set()
+            while not self._stop_event.is_set():
+                try:
+                    self.control_loop()
+                except Exception:
+                    log.exception("Control loop error")
+                    _ = self.hardware.set_fail_safe()
 
-            time.sleep(self.config.interval_seconds)
+                # Unlike time.sleep(), returns as soon as shutdown() is requested
+                _ = self._stop_event.wait(self.config.interval_seconds)
 
-        _ = self.hardware.set_fail_safe()
+            self.running = False
+            _ = self.hardware.set_fail_safe()
+        finally:
+            self.hardware.close()
 
     def control_loop(self) -> None:
         """Main control loop iteration."""
@@ -666,16 +792,16 @@ class FanDaemon:
 
         zone_speeds = self._compute_zone_speeds(temps)
 
-        for zone, (speed, _trigger, _trigger_temp) in zone_speeds.items():
-            if not self.hardware.set_zone_speed(zone, speed):
-                _ = self.hardware.set_fail_safe()
-                self.active_thresholds.clear()
-                self.time_in_drop_zone.clear()
-                self.last_logged_speeds.clear()
-                return
+        speeds = {zone: spd for zone, (spd, _, _) in zone_speeds.items()}
+        if not self.hardware.set_zone_speeds(speeds):
+            _ = self.hardware.set_fail_safe()
+            self.active_thresholds.clear()
+            self.time_in_drop_zone.clear()
+            self.last_logged_speeds.clear()
+            return
 
         # Check if any speeds changed
-        current_speeds = {z: spd for z, (spd, _, _) in zone_speeds.items()}
+        current_speeds = [spd for spd, _, _ in zone_speeds.values()]
         speeds_changed = current_speeds != self.last_logged_speeds
 
         # Check if heartbeat is due (0 = disabled)
@@ -683,31 +809,37 @@ class FanDaemon:
         hb = self.config.heartbeat_seconds
         heartbeat_due = hb > 0 and (now - self.last_heartbeat) >= hb
 
-        status = self._format_status(zone_speeds, temps)
-
+        # Status formatting is the most expensive part of a tick, only do it
+        # when the result is actually emitted.
         if speeds_changed:
-            log.info(status)
+            if log.isEnabledFor(logging.INFO):
+                log.info("%s", self._format_status(zone_speeds, temps))
             self.last_logged_speeds = current_speeds
             self.last_heartbeat = now
         elif heartbeat_due:
-            # Append (heartbeat) to first line
-            lines = status.split("\n", 1)
-            lines[0] += " (heartbeat)"
-            log.info("\n".join(lines))
+            if log.isEnabledFor(logging.INFO):
+                # Append (heartbeat) to first line
+                lines = self._format_status(zone_speeds, temps).split("\n", 1)
+                lines[0] += " (heartbeat)"
+                log.info("%s", "\n".join(lines))
             self.last_heartbeat = now
-        else:
-            log.debug(status)
+        elif log.isEnabledFor(logging.DEBUG):
+            log.debug("%s", self._format_status(zone_speeds, temps))
 
     def shutdown(
         self,
         signum: int | None = None,
         _frame: object = None,
     ) -> None:
-        """Clean shutdown - set fans to fail-safe."""
+        """Request clean shutdown; run() exits and sets fans to fail-safe.
+
+        Safe to call from a signal handler: it only flips state, so an
+        in-flight control loop iteration (e.g. an ipmitool write) finishes
+        rather than being interrupted, and the inter-tick wait wakes at once.
+        """
         log.info("Shutting down (signal %d)", signum or 0)
         self.running = False
-        _ = self.hardware.set_fail_safe()
-        sys.exit(0)
+        self._stop_event.set()
 
     def _format_status(
         self,
@@ -716,7 +848,7 @@ class FanDaemon:
     ) -> str:
         """Format multiline status for logging."""
         lines: list[str] = []
-        zones = sorted(self.hardware.get_zones())
+        zones = self._zones
 
         # First line: zone speeds
         zone_parts = [f"z{z}={spd}%" for z, (spd, _, _) in sorted(zone_speeds.items())]
@@ -729,7 +861,7 @@ class FanDaemon:
         all_names: list[str] = []
         for name, values in temps.items():
             for idx in range(len(values or ())):
-                all_names.append(f"{name}{idx}")
+                all_names.append(_device_name(name, idx))
         max_name_len = max((len(n) for n in all_names), default=10)
 
         # Partition devices: those with curves first, then informational
@@ -745,8 +877,8 @@ class FanDaemon:
 
         # Format each device (curves first, then informational)
         for name, idx, temp in devices_with_curves + devices_without_curves:
-            device_name = f"{name}{idx}"
-            device_tag = f"{name.upper()}{idx}"
+            device_name = _device_name(name, idx)
+            device_tag = _device_tag(name, idx)
 
             # Get zone speeds from curves, tracking if wildcard
             zone_results: list[
@@ -829,9 +961,9 @@ class FanDaemon:
         """Compute fan speed per zone. Returns {zone: (speed, trigger, temp)}."""
         current_time = time.time()
         results: dict[int, tuple[int, str, int]] = {}
-        for zone in self.hardware.get_zones():
-            # (speed, trigger_name, temp, dev_name, dev_idx, new_thresh, new_drop_time)
-            candidates: list[tuple[float, str, int, str, int, float, float | None]] = []
+        for zone in self._zones:
+            # Running max of (speed, trigger, temp); first device wins ties
+            best: tuple[float, str, int] | None = None
             for name, values in temps.items():
                 for idx, temp in enumerate(values or ()):
                     if (result := self.speed.get(name, idx, zone)) is not None:
@@ -849,22 +981,10 @@ class FanDaemon:
                         # Update hysteresis state for this device
                         self.time_in_drop_zone[key] = new_drop_time
                         self.active_thresholds[key] = new_thresh
-                        candidates.append(
-                            (
-                                spd,
-                                f"{name.upper()}{idx}",
-                                temp,
-                                name,
-                                idx,
-                                new_thresh,
-                                new_drop_time,
-                            )
-                        )
-            if candidates:
-                spd, trigger, temp, _, _, _, _ = max(
-                    candidates,
-                    key=lambda x: x[0],
-                )
+                        if best is None or spd > best[0]:
+                            best = (spd, _device_tag(name, idx), temp)
+            if best is not None:
+                spd, trigger, temp = best
                 results[zone] = (int(spd), trigger, temp)
             else:
                 # No mappings for this zone - fail-safe to 100%
@@ -872,6 +992,18 @@ class FanDaemon:
         return results
 
 
+@functools.cache
+def _device_name(name: str, idx: int) -> str:
+    """Return device name for status lines, e.g. "gpu0" (memoized)."""
+    return f"{name}{idx}"
+
+
+@functools.cache
+def _device_tag(name: str, idx: int) -> str:
+    """Return device tag for triggers, e.g. "GPU0" (memoized)."""
+    return f"{name.upper()}{idx}"
+
+
 def main() -> None:
     argparser = argparse.ArgumentParser(
         description="Fan daemon for server motherboards",
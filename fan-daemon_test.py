@@ -4,20 +4,19 @@
 
 from __future__ import annotations
 
+import argparse
+import subprocess
 import sys
-from importlib.machinery import SourceFileLoader
-from importlib.util import module_from_spec, spec_from_loader
+import threading
+import time
+from collections.abc import Callable, Iterator
 from typing import final
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-_spec = spec_from_loader("fan_daemon", SourceFileLoader("fan_daemon", "fan-daemon.py"))
-assert _spec is not None
-_module = module_from_spec(_spec)
-sys.modules["fan_daemon"] = _module
-assert _spec.loader is not None
-_spec.loader.exec_module(_module)
+# fan-daemon.py is not an importable name; conftest.py loads it once per session
+_module = sys.modules["fan_daemon"]
 
 FanSpeed = _module.FanSpeed
 FanDaemon = _module.FanDaemon
@@ -25,22 +24,70 @@ SupermicroH13 = _module.SupermicroH13
 run_cmd = _module.run_cmd
 
 
+class _FakeSensor:
+    """Minimal Sensor returning a fixed result and counting reads."""
+
+    __slots__ = ("calls", "result")
+
+    def __init__(self, result: dict[str, tuple[float, ...] | None]) -> None:
+        self.result = result
+        self.calls = 0
+
+    def get(self) -> dict[str, tuple[float, ...] | None]:
+        self.calls += 1
+        return self.result
+
+
 def _make_mock_sensors(
     cpu: tuple[float, ...] | None = (45.0,),
     gpu: tuple[float, ...] | None = (65.0, 70.0),
     hdd: tuple[float, ...] | None = None,
     nvme: tuple[float, ...] | None = None,
-) -> list[MagicMock]:
-    """Create mock sensor list for SupermicroH13 tests."""
-    cpu_sensor = MagicMock()
-    cpu_sensor.get.return_value = {"cpu": cpu}
-    gpu_sensor = MagicMock()
-    gpu_sensor.get.return_value = {"gpu": gpu}
-    hdd_sensor = MagicMock()
-    hdd_sensor.get.return_value = {"hdd": hdd}
-    nvme_sensor = MagicMock()
-    nvme_sensor.get.return_value = {"nvme": nvme}
-    return [cpu_sensor, gpu_sensor, hdd_sensor, nvme_sensor]
+) -> list[_FakeSensor]:
+    """Create fake sensor list for SupermicroH13 tests."""
+    return [
+        _FakeSensor({"cpu": cpu}),
+        _FakeSensor({"gpu": gpu}),
+        _FakeSensor({"hdd": hdd}),
+        _FakeSensor({"nvme": nvme}),
+    ]
+
+
+def _fake_bmc(
+    calls: list[tuple[list[str], str | None]],
+    speeds: dict[int, int],
+    *,
+    exec_ok: bool = True,
+    ignore: tuple[int, ...] = (),
+) -> Callable[..., str | None]:
+    """Return a run_cmd that applies raw fan set/get commands to speeds.
+
+    Zones in ignore silently keep their speed, as when one line of an
+    `ipmitool exec` script fails but the last line succeeds.
+    """
+
+    def apply(args: list[str]) -> str | None:
+        zone, percent = int(args[-2], 16), int(args[-1], 16)
+        if zone not in ignore:
+            speeds[zone] = percent
+        return ""
+
+    def run_cmd(
+        cmd: list[str], _timeout: float = 5.0, stdin: str | None = None
+    ) -> str | None:
+        calls.append((cmd, stdin))
+        if cmd[1] == "exec":
+            if not exec_ok or stdin is None:
+                return None
+            for line in stdin.splitlines():
+                _ = apply(line.split())
+            return ""
+        if cmd[5] == "0x00":  # Get zone speed
+            zone = int(cmd[-1], 16)
+            return f" {speeds[zone]:02x}\n" if zone in speeds else None
+        return apply(cmd[1:])
+
+    return run_cmd
 
 
 class MockHardware:
@@ -50,6 +97,7 @@ class MockHardware:
     zones: tuple[int, ...]
     zone_speeds: dict[int, int]
     fail_safe_called: bool
+    closed: bool
 
     def __init__(self, zones: tuple[int, ...] = (0, 1)) -> None:
         self.zones = zones
@@ -68,6 +116,7 @@ class MockHardware:
         }
         self.zone_speeds = {}
         self.fail_safe_called = False
+        self.closed = False
 
     def initialize(self) -> bool:
         return True
@@ -82,303 +131,321 @@ class MockHardware:
         self.zone_speeds[zone] = percent
         return True
 
+    def set_zone_speeds(self, speeds: dict[int, int]) -> bool:
+        return all(self.set_zone_speed(z, p) for z, p in speeds.items())
+
     def set_fail_safe(self) -> bool:
         self.fail_safe_called = True
         return True
 
+    def close(self) -> None:
+        self.closed = True
 
-class TestFanSpeedConfigParse:
-    def test_basic(self) -> None:
-        _, mapping = FanSpeed.Config._parse_speeds("x=40:15,60:30,80:100")
-        assert mapping == (
-            (40.0, 15.0, None, None),
-            (60.0, 30.0, None, None),
-            (80.0, 100.0, None, None),
-        )
 
-    def test_sorts_by_temp(self) -> None:
-        _, mapping = FanSpeed.Config._parse_speeds("x=80:100,40:15,60:30")
-        assert mapping == (
-            (40.0, 15.0, None, None),
-            (60.0, 30.0, None, None),
-            (80.0, 100.0, None, None),
-        )
+@pytest.fixture(scope="module")
+def default_fan_speed() -> FanSpeed:
+    """FanSpeed with the built-in mappings; tests must not modify it."""
+    return FanSpeed.Config().setup()
 
-    def test_with_hysteresis_celsius(self) -> None:
-        _, mapping = FanSpeed.Config._parse_speeds("x=40:15:3,80:100:5")
-        assert mapping == ((40.0, 15.0, 3.0, None), (80.0, 100.0, 5.0, None))
 
-    def test_with_hysteresis_full(self) -> None:
-        _, mapping = FanSpeed.Config._parse_speeds("x=40:15:3:20,80:100:5:60")
-        assert mapping == ((40.0, 15.0, 3.0, 20.0), (80.0, 100.0, 5.0, 60.0))
+@pytest.fixture
+def hardware() -> MockHardware:
+    return MockHardware()
 
-    def test_with_hysteresis_seconds_empty_celsius(self) -> None:
-        # Empty hyst_c placeholder: 70:80::60 means default temp hyst, 60s time hyst
-        _, mapping = FanSpeed.Config._parse_speeds("x=40:15::30,80:100::60")
-        assert mapping == ((40.0, 15.0, None, 30.0), (80.0, 100.0, None, 60.0))
 
-    def test_empty_returns_none(self) -> None:
-        _, mapping = FanSpeed.Config._parse_speeds("x=")
-        assert mapping is None
+@pytest.fixture
+def daemon(hardware: MockHardware, default_fan_speed: FanSpeed) -> FanDaemon:
+    """FanDaemon with default config over the hardware and default_fan_speed."""
+    return FanDaemon.Config().setup(hardware, default_fan_speed)
 
-    def test_too_few_points(self) -> None:
-        with pytest.raises(ValueError, match="at least 2"):
-            FanSpeed.Config._parse_speeds("x=40:15")
 
-    def test_invalid_speed(self) -> None:
-        with pytest.raises(ValueError, match="Speed must be 0-100"):
-            FanSpeed.Config._parse_speeds("x=40:15,80:150")
+@pytest.fixture
+def no_signal_handlers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep run() from installing its SIGTERM/SIGINT handlers in pytest."""
+    monkeypatch.setattr(_module.signal, "signal", lambda *_args: None)
 
-    def test_invalid_hysteresis_celsius(self) -> None:
-        with pytest.raises(ValueError, match="Hysteresis celsius must be >= 0"):
-            FanSpeed.Config._parse_speeds("x=40:15:-5,80:100:5")
 
-    def test_invalid_hysteresis_seconds(self) -> None:
-        with pytest.raises(ValueError, match="Hysteresis seconds must be >= 0"):
-            FanSpeed.Config._parse_speeds("x=40:15:5:-30,80:100:5:60")
-
-    def test_invalid_format(self) -> None:
-        with pytest.raises(ValueError, match="Invalid point format"):
-            FanSpeed.Config._parse_speeds("x=40:15:5:10:extra,80:100")
-
-    def test_gpu_zone(self) -> None:
-        key, mapping = FanSpeed.Config._parse_speeds("gpu-zone=40:15,80:100")
-        assert key == ("gpu", -1, -1)
-        assert mapping == ((40.0, 15.0, None, None), (80.0, 100.0, None, None))
+def _assert_all_in(expected: tuple[str, ...], text: str) -> None:
+    """Assert every expected substring is in text, reporting all that are not."""
+    missing = [token for token in expected if token not in text]
+    assert not missing, f"missing {missing} in:\n{text}"
 
-    def test_gpu_zone0(self) -> None:
-        key, _ = FanSpeed.Config._parse_speeds("gpu-zone0=40:15,80:100")
-        assert key == ("gpu", -1, 0)
 
-    def test_gpu0_zone1(self) -> None:
-        key, _ = FanSpeed.Config._parse_speeds("gpu0-zone1=40:15,80:100")
-        assert key == ("gpu", 0, 1)
-
-    def test_disabled(self) -> None:
-        key, mapping = FanSpeed.Config._parse_speeds("hdd-zone=")
-        assert key == ("hdd", -1, -1)
-        assert mapping is None
-
-    def test_missing_equals(self) -> None:
-        with pytest.raises(ValueError, match="missing '='"):
-            FanSpeed.Config._parse_speeds("gpu-zone40:15,80:100")
+def _run_steps(
+    daemon: FanDaemon,
+    hardware: MockHardware,
+    steps: list[tuple[dict[str, tuple[int, ...] | None], dict[int, int]]],
+) -> None:
+    """Apply each temps update, run one control loop and check zone speeds."""
+    assert hardware.temps is not None
+    for temps, expected in steps:
+        hardware.temps.update(temps)
+        daemon.control_loop()
+        assert {zone: hardware.zone_speeds[zone] for zone in expected} == expected
 
-    def test_invalid_key_format(self) -> None:
-        with pytest.raises(ValueError, match="Invalid mapping key format"):
-            FanSpeed.Config._parse_speeds("123gpu=40:15,80:100")  # starts with digit
 
-    def test_ram_zone(self) -> None:
-        key, _ = FanSpeed.Config._parse_speeds("ram-zone0=40:15,80:100")
-        assert key == ("ram", -1, 0)
+class TestFanSpeedConfigParse:
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [
+            pytest.param(
+                "x=40:15,60:30,80:100",
+                (
+                    (40.0, 15.0, None, None),
+                    (60.0, 30.0, None, None),
+                    (80.0, 100.0, None, None),
+                ),
+                id="basic",
+            ),
+            pytest.param(
+                "x=80:100,40:15,60:30",
+                (
+                    (40.0, 15.0, None, None),
+                    (60.0, 30.0, None, None),
+                    (80.0, 100.0, None, None),
+                ),
+                id="sorts_by_temp",
+            ),
+            pytest.param(
+                "x=40:15:3,80:100:5",
+                ((40.0, 15.0, 3.0, None), (80.0, 100.0, 5.0, None)),
+                id="with_hysteresis_celsius",
+            ),
+            pytest.param(
+                "x=40:15:3:20,80:100:5:60",
+                ((40.0, 15.0, 3.0, 20.0), (80.0, 100.0, 5.0, 60.0)),
+                id="with_hysteresis_full",
+            ),
+            # Empty hyst_c placeholder: 70:80::60 means default temp hyst, 60s time
+            pytest.param(
+                "x=40:15::30,80:100::60",
+                ((40.0, 15.0, None, 30.0), (80.0, 100.0, None, 60.0)),
+                id="with_hysteresis_seconds_empty_celsius",
+            ),
+            pytest.param("x=", None, id="empty_returns_none"),
+            pytest.param(
+                "gpu-zone=40:15,80:100",
+                ((40.0, 15.0, None, None), (80.0, 100.0, None, None)),
+                id="gpu_zone",
+            ),
+            pytest.param("hdd-zone=", None, id="disabled"),
+        ],
+    )
+    def test_mapping(
+        self, spec: str, expected: tuple[tuple[float, ...], ...] | None
+    ) -> None:
+        _, mapping = FanSpeed.Config._parse_speeds(spec)
+        assert mapping == expected
+
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [
+            pytest.param("gpu-zone=40:15,80:100", ("gpu", -1, -1), id="gpu_zone"),
+            pytest.param("gpu-zone0=40:15,80:100", ("gpu", -1, 0), id="gpu_zone0"),
+            pytest.param("gpu0-zone1=40:15,80:100", ("gpu", 0, 1), id="gpu0_zone1"),
+            pytest.param("ram-zone0=40:15,80:100", ("ram", -1, 0), id="ram_zone"),
+            pytest.param("hdd-zone=", ("hdd", -1, -1), id="disabled"),
+        ],
+    )
+    def test_key(self, spec: str, expected: tuple[str, int, int]) -> None:
+        key, _ = FanSpeed.Config._parse_speeds(spec)
+        assert key == expected
+
+    @pytest.mark.parametrize(
+        ("spec", "match"),
+        [
+            pytest.param("x=40:15", "at least 2", id="too_few_points"),
+            pytest.param("x=40:15,80:150", "Speed must be 0-100", id="invalid_speed"),
+            pytest.param(
+                "x=40:15:-5,80:100:5",
+                "Hysteresis celsius must be >= 0",
+                id="invalid_hysteresis_celsius",
+            ),
+            pytest.param(
+                "x=40:15:5:-30,80:100:5:60",
+                "Hysteresis seconds must be >= 0",
+                id="invalid_hysteresis_seconds",
+            ),
+            pytest.param(
+                "x=40:15:5:10:extra,80:100",
+                "Invalid point format",
+                id="invalid_format",
+            ),
+            pytest.param("gpu-zone40:15,80:100", "missing '='", id="missing_equals"),
+            pytest.param(  # Starts with digit
+                "123gpu=40:15,80:100",
+                "Invalid mapping key format",
+                id="invalid_key_format",
+            ),
+        ],
+    )
+    def test_invalid(self, spec: str, match: str) -> None:
+        with pytest.raises(ValueError, match=match):
+            FanSpeed.Config._parse_speeds(spec)
 
 
 class TestFanSpeedGet:
-    def test_exact_match(self) -> None:
-        m = FanSpeed.Config(
-            speeds={
-                ("gpu", 0, 1): ((50.0, 20.0, None, None), (80.0, 100.0, None, None))
-            }
-        ).setup()
-        result = m.get("gpu", 0, 1)
-        assert result is not None
-        mapping, key = result
-        assert mapping == ((50.0, 20.0, None, None), (80.0, 100.0, None, None))
-        assert key == ("gpu", 0, 1)
-
-    def test_fallback_to_all_zones(self) -> None:
-        m = FanSpeed.Config(
-            speeds={
-                ("gpu", 0, -1): ((50.0, 20.0, None, None), (80.0, 100.0, None, None))
-            }
-        ).setup()
-        result = m.get("gpu", 0, 1)
-        assert result is not None
-        mapping, key = result
-        assert mapping == ((50.0, 20.0, None, None), (80.0, 100.0, None, None))
-        assert key == ("gpu", 0, -1)  # matched wildcard zone
-
-    def test_fallback_to_all_devices(self) -> None:
-        m = FanSpeed.Config(
-            speeds={
-                ("gpu", -1, 1): ((50.0, 20.0, None, None), (80.0, 100.0, None, None))
-            }
-        ).setup()
-        result = m.get("gpu", 0, 1)
-        assert result is not None
-        mapping, key = result
-        assert mapping == ((50.0, 20.0, None, None), (80.0, 100.0, None, None))
-        assert key == ("gpu", -1, 1)  # matched wildcard device
-
-    def test_default_gpu(self) -> None:
+    @pytest.mark.parametrize(
+        "key",
+        [
+            pytest.param(("gpu", 0, 1), id="exact_match"),
+            pytest.param(("gpu", 0, -1), id="fallback_to_all_zones"),
+            pytest.param(("gpu", -1, 1), id="fallback_to_all_devices"),
+        ],
+    )
+    def test_precedence(self, key: tuple[str, int, int]) -> None:
+        """A query for gpu0 zone 1 resolves to the one configured key."""
+        mapping = ((50.0, 20.0, None, None), (80.0, 100.0, None, None))
+        m = FanSpeed.Config(speeds={key: mapping}).setup()
+        assert m.get("gpu", 0, 1) == (mapping, key)
+
+    def test_default_gpu(self, default_fan_speed: FanSpeed) -> None:
+        assert default_fan_speed.get("gpu", 0, 0) is not None
+        assert default_fan_speed.get("gpu", 0, 1) is not None
+
+    def test_default_cpu_zone0_only(self, default_fan_speed: FanSpeed) -> None:
+        assert default_fan_speed.get("cpu", 0, 0) is not None
+        assert default_fan_speed.get("cpu", 0, 1) is None
+
+    def test_memoized(self) -> None:
         m = FanSpeed.Config().setup()
-        assert m.get("gpu", 0, 0) is not None
-        assert m.get("gpu", 0, 1) is not None
+        first = m.get("gpu", 0, 0)
+        m.config.speeds = {}  # Not consulted again for a resolved query
+        assert m.get("gpu", 0, 0) is first
+        assert m.get("gpu", 1, 0) is None
 
-    def test_default_cpu_zone0_only(self) -> None:
-        m = FanSpeed.Config().setup()
-        assert m.get("cpu", 0, 0) is not None
-        assert m.get("cpu", 0, 1) is None
+
+# Shared lookup() mappings: (temp, speed, hyst_celsius, hyst_seconds)
+_MAP_2PT = ((40.0, 15.0, None, None), (80.0, 100.0, None, None))
+_MAP_HYST = ((40.0, 15.0, 5.0, None), (70.0, 50.0, 5.0, None), (80.0, 100.0, 5.0, None))
+_MAP_TIME = ((40.0, 15.0, 5.0, 30.0), (70.0, 50.0, 5.0, 30.0))
 
 
 class TestFanSpeedLookup:
-    @pytest.fixture
-    def m(self) -> FanSpeed:
+    @pytest.fixture(scope="class")  # lookup() is pure, share one instance
+    @classmethod
+    def m(cls) -> FanSpeed:
         return FanSpeed.Config(hysteresis_celsius=5.0, hysteresis_seconds=0.0).setup()
 
-    def test_below_min(self, m: FanSpeed) -> None:
-        mapping = ((40.0, 15.0, None, None), (80.0, 100.0, None, None))
-        speed, thresh, drop_time = m.lookup(30, mapping)
-        assert speed == 15.0
-        assert thresh == 40.0  # returns first threshold
-        assert drop_time is None
-
-    def test_above_max(self, m: FanSpeed) -> None:
-        mapping = ((40.0, 15.0, None, None), (80.0, 100.0, None, None))
-        speed, thresh, drop_time = m.lookup(90, mapping)
-        assert speed == 100.0
-        assert thresh == 80.0
-        assert drop_time is None
-
-    def test_between_thresholds(self, m: FanSpeed) -> None:
-        mapping = ((40.0, 15.0, None, None), (80.0, 100.0, None, None))
-        speed, thresh, drop_time = m.lookup(60, mapping)
-        assert speed == 15.0  # piecewise constant: 60 >= 40, < 80
-        assert thresh == 40.0
-        assert drop_time is None
-
-    def test_hysteresis_rising(self, m: FanSpeed) -> None:
-        mapping = (
-            (40.0, 15.0, 5.0, None),
-            (70.0, 50.0, 5.0, None),
-            (80.0, 100.0, 5.0, None),
-        )
-        # Rising from below - active at 40, now at 75 -> should go to 70 threshold
-        speed, thresh, drop_time = m.lookup(75, mapping, active_threshold=40.0)
-        assert speed == 50.0
-        assert thresh == 70.0
-        assert drop_time is None
-
-    def test_hysteresis_falling_stays(self, m: FanSpeed) -> None:
-        mapping = (
-            (40.0, 15.0, 5.0, None),
-            (70.0, 50.0, 5.0, None),
-            (80.0, 100.0, 5.0, None),
-        )
-        # Falling from 80 to 68 - should stay at 70 threshold (68 >= 70-5=65)
-        speed, thresh, drop_time = m.lookup(68, mapping, active_threshold=70.0)
-        assert speed == 50.0
-        assert thresh == 70.0
-        assert drop_time is None  # Not in drop zone yet
-
-    def test_hysteresis_falling_drops(self, m: FanSpeed) -> None:
-        mapping = (
-            (40.0, 15.0, 5.0, None),
-            (70.0, 50.0, 5.0, None),
-            (80.0, 100.0, 5.0, None),
-        )
-        # Falling from 70 to 64 - should drop to 40 threshold (64 < 70-5=65)
-        # With hysteresis_seconds=0, drops immediately
-        speed, thresh, drop_time = m.lookup(64, mapping, active_threshold=70.0)
-        assert speed == 15.0
-        assert thresh == 40.0
-        assert drop_time is None
-
-    def test_time_hysteresis_starts_timer(self) -> None:
-        """When temp enters drop zone, timer starts and speed stays high."""
-        m = FanSpeed(
-            FanSpeed.Config(hysteresis_celsius=0.0, hysteresis_seconds=30.0, speeds={})
-        )
-        mapping = ((40.0, 15.0, 5.0, 30.0), (70.0, 50.0, 5.0, 30.0))
-        # Temp 64 < 70-5=65, enters drop zone, but timer just started
-        speed, thresh, drop_time = m.lookup(
-            64, mapping, active_threshold=70.0, time_in_drop_zone=None, current_time=100
-        )
-        assert speed == 50.0  # Stay at active speed
-        assert thresh == 70.0  # Stay at active threshold
-        assert drop_time == 100  # Timer started
+    # (temp, mapping, active_threshold) -> (speed, thresh, drop_time)
+    @pytest.mark.parametrize(
+        ("temp", "mapping", "active_threshold", "expected"),
+        [
+            # Returns first threshold
+            pytest.param(30, _MAP_2PT, None, (15.0, 40.0, None), id="below_min"),
+            pytest.param(90, _MAP_2PT, None, (100.0, 80.0, None), id="above_max"),
+            # Piecewise constant: 60 >= 40, < 80
+            pytest.param(60, _MAP_2PT, None, (15.0, 40.0, None), id="between"),
+            # Rising from below - active at 40, now at 75 -> 70 threshold
+            pytest.param(
+                75, _MAP_HYST, 40.0, (50.0, 70.0, None), id="hysteresis_rising"
+            ),
+            # Falling from 80 to 68 - stays at 70 threshold (68 >= 70-5=65), not in
+            # drop zone yet
+            pytest.param(
+                68, _MAP_HYST, 70.0, (50.0, 70.0, None), id="hysteresis_falling_stays"
+            ),
+            # Falling from 70 to 64 - drops to 40 threshold (64 < 70-5=65); with
+            # hysteresis_seconds=0, drops immediately
+            pytest.param(
+                64, _MAP_HYST, 70.0, (15.0, 40.0, None), id="hysteresis_falling_drops"
+            ),
+        ],
+    )
+    def test_lookup(
+        self,
+        m: FanSpeed,
+        temp: float,
+        mapping: tuple[tuple[float, float, float | None, float | None], ...],
+        active_threshold: float | None,
+        expected: tuple[float, float, float | None],
+    ) -> None:
+        assert m.lookup(temp, mapping, active_threshold=active_threshold) == expected
 
-    def test_time_hysteresis_waiting(self) -> None:
-        """While waiting for time hysteresis, stay at high speed."""
-        m = FanSpeed(
+    @pytest.fixture(scope="class")
+    @classmethod
+    def m_time(cls) -> FanSpeed:
+        return FanSpeed(
             FanSpeed.Config(hysteresis_celsius=0.0, hysteresis_seconds=30.0, speeds={})
         )
-        mapping = ((40.0, 15.0, 5.0, 30.0), (70.0, 50.0, 5.0, 30.0))
-        # 15 seconds into 30s wait
-        speed, thresh, drop_time = m.lookup(
-            64, mapping, active_threshold=70.0, time_in_drop_zone=100, current_time=115
-        )
-        assert speed == 50.0
-        assert thresh == 70.0
-        assert drop_time == 100  # Timer preserved
 
-    def test_time_hysteresis_expires(self) -> None:
-        """When time hysteresis expires, drop to lower speed."""
-        m = FanSpeed(
-            FanSpeed.Config(hysteresis_celsius=0.0, hysteresis_seconds=30.0, speeds={})
-        )
-        mapping = ((40.0, 15.0, 5.0, 30.0), (70.0, 50.0, 5.0, 30.0))
-        # 30+ seconds elapsed
-        speed, thresh, drop_time = m.lookup(
-            64, mapping, active_threshold=70.0, time_in_drop_zone=100, current_time=130
+    # (temp, time_in_drop_zone, current_time) -> (speed, thresh, drop_time); the
+    # drop zone starts below 70-5=65
+    @pytest.mark.parametrize(
+        ("temp", "time_in_drop_zone", "current_time", "expected"),
+        [
+            # Enters drop zone: timer starts, stay at active speed and threshold
+            pytest.param(64, None, 100, (50.0, 70.0, 100), id="starts_timer"),
+            # 15 seconds into 30s wait: stay high, timer preserved
+            pytest.param(64, 100, 115, (50.0, 70.0, 100), id="waiting"),
+            # 30+ seconds elapsed: drop to lower speed, timer reset
+            pytest.param(64, 100, 130, (15.0, 40.0, None), id="expires"),
+            # Temp back above drop zone threshold (66 >= 65): timer reset
+            pytest.param(66, 100, 115, (50.0, 70.0, None), id="reset_on_spike"),
+        ],
+    )
+    def test_time_hysteresis(
+        self,
+        m_time: FanSpeed,
+        temp: float,
+        time_in_drop_zone: float | None,
+        current_time: float,
+        expected: tuple[float, float, float | None],
+    ) -> None:
+        assert (
+            m_time.lookup(
+                temp,
+                _MAP_TIME,
+                active_threshold=70.0,
+                time_in_drop_zone=time_in_drop_zone,
+                current_time=current_time,
+            )
+            == expected
         )
-        assert speed == 15.0  # Dropped
-        assert thresh == 40.0  # New threshold
-        assert drop_time is None  # Timer reset
 
-    def test_time_hysteresis_reset_on_spike(self) -> None:
-        """Temp spike resets the timer."""
-        m = FanSpeed(
-            FanSpeed.Config(hysteresis_celsius=0.0, hysteresis_seconds=30.0, speeds={})
-        )
-        mapping = ((40.0, 15.0, 5.0, 30.0), (70.0, 50.0, 5.0, 30.0))
-        # Temp goes back above drop zone threshold (66 >= 65)
-        speed, thresh, drop_time = m.lookup(
-            66, mapping, active_threshold=70.0, time_in_drop_zone=100, current_time=115
-        )
-        assert speed == 50.0
-        assert thresh == 70.0
-        assert drop_time is None  # Timer reset
+
+# Read-only mappings for TestFanDaemon.fan_speed, built once at import
+_DAEMON_SPEEDS = {
+    ("cpu", -1, -1): (
+        (0.0, 15.0, None, None),
+        (40.0, 15.0, None, None),
+        (80.0, 100.0, None, None),
+    ),
+    ("gpu", -1, -1): (
+        (0.0, 15.0, None, None),
+        (40.0, 15.0, None, None),
+        (80.0, 100.0, None, None),
+    ),
+    ("ram", -1, -1): (
+        (0.0, 15.0, None, None),
+        (40.0, 15.0, None, None),
+        (80.0, 100.0, None, None),
+    ),
+    ("hdd", -1, -1): (
+        (0.0, 15.0, None, None),
+        (25.0, 15.0, None, None),
+        (50.0, 100.0, None, None),
+    ),
+    ("nvme", -1, -1): (
+        (0.0, 15.0, None, None),
+        (35.0, 15.0, None, None),
+        (70.0, 100.0, None, None),
+    ),
+}
 
 
 class TestFanDaemon:
-    @pytest.fixture
-    def fan_speed(self) -> FanSpeed:
+    # FanSpeed holds no per-tick state (hysteresis state lives in FanDaemon), so
+    # share one across the class; hardware and daemon stay per-test
+    @pytest.fixture(scope="class")
+    @classmethod
+    def fan_speed(cls) -> FanSpeed:
         return FanSpeed.Config(
-            speeds={
-                ("cpu", -1, -1): (
-                    (0.0, 15.0, None, None),
-                    (40.0, 15.0, None, None),
-                    (80.0, 100.0, None, None),
-                ),
-                ("gpu", -1, -1): (
-                    (0.0, 15.0, None, None),
-                    (40.0, 15.0, None, None),
-                    (80.0, 100.0, None, None),
-                ),
-                ("ram", -1, -1): (
-                    (0.0, 15.0, None, None),
-                    (40.0, 15.0, None, None),
-                    (80.0, 100.0, None, None),
-                ),
-                ("hdd", -1, -1): (
-                    (0.0, 15.0, None, None),
-                    (25.0, 15.0, None, None),
-                    (50.0, 100.0, None, None),
-                ),
-                ("nvme", -1, -1): (
-                    (0.0, 15.0, None, None),
-                    (35.0, 15.0, None, None),
-                    (70.0, 100.0, None, None),
-                ),
-            },
+            speeds=_DAEMON_SPEEDS,
             hysteresis_celsius=5.0,
             hysteresis_seconds=0.0,
         ).setup()
 
-    @pytest.fixture
-    def hardware(self) -> MockHardware:
-        return MockHardware()
-
     @pytest.fixture
     def daemon(self, fan_speed: FanSpeed, hardware: MockHardware) -> FanDaemon:
         config = FanDaemon.Config()
@@ -429,22 +496,18 @@ class TestFanDaemon:
             hysteresis_seconds=0.0,  # Disable time hysteresis for this test
         ).setup()
         daemon = FanDaemon.Config().setup(hardware, fan_speed)
-        assert hardware.temps is not None
-        hardware.temps["cpu"] = (75,)
-        hardware.temps["gpu"] = None
-        daemon.control_loop()
-        # Should be at 70 threshold -> 50%
-        assert hardware.zone_speeds[0] == 50
-
-        # Drop to 68 - should stay at 50% due to hysteresis (68 >= 70-5=65)
-        hardware.temps["cpu"] = (68,)
-        daemon.control_loop()
-        assert hardware.zone_speeds[0] == 50
-
-        # Drop to 64 - should drop to 15% (64 < 65)
-        hardware.temps["cpu"] = (64,)
-        daemon.control_loop()
-        assert hardware.zone_speeds[0] == 15
+        _run_steps(
+            daemon,
+            hardware,
+            [
+                # Should be at 70 threshold -> 50%
+                ({"cpu": (75,), "gpu": None}, {0: 50}),
+                # Drop to 68 - should stay at 50% due to hysteresis (68 >= 70-5=65)
+                ({"cpu": (68,)}, {0: 50}),
+                # Drop to 64 - should drop to 15% (64 < 65)
+                ({"cpu": (64,)}, {0: 15}),
+            ],
+        )
 
     def test_hysteresis_non_winner_threshold_updated(
         self, hardware: MockHardware
@@ -554,9 +617,15 @@ class TestFanDaemon:
             def set_zone_speed(self, _zone: int, _percent: int) -> bool:
                 return True
 
+            def set_zone_speeds(self, _speeds: dict[int, int]) -> bool:
+                return True
+
             def set_fail_safe(self) -> bool:
                 return True
 
+            def close(self) -> None:
+                pass
+
         daemon = FanDaemon.Config().setup(CustomHardware(), fan_speed)
         temps = daemon.hardware.get_temps()
         assert temps is not None
@@ -572,10 +641,17 @@ class TestSupermicroH13:
     """Tests for SupermicroH13 hardware class with mocked sensors."""
 
     @pytest.fixture
-    def hw(self) -> SupermicroH13:
+    def hw(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[SupermicroH13]:
+        # Swap the sensor constructors for fakes so setup() doesn't probe the
+        # host's sensors and each test gets a fresh instance
+        cpu, gpu, hdd, nvme = _make_mock_sensors()
+        monkeypatch.setattr(_module.sensors, "K10Temp", lambda: cpu)
+        monkeypatch.setattr(_module.sensors, "gpu_sensor", lambda _ms=0: gpu)
+        monkeypatch.setattr(_module.sensors, "Smartctl", lambda: hdd)
+        monkeypatch.setattr(_module.sensors, "Nvmecli", lambda: nvme)
         hw = SupermicroH13.Config(ipmi_write_delay_seconds=0.0).setup()
-        hw._sensors = _make_mock_sensors()
-        return hw
+        yield hw
+        hw.close()
 
     def test_get_temps_success(self, hw: SupermicroH13) -> None:
         hw._sensors = _make_mock_sensors(
@@ -610,17 +686,84 @@ class TestSupermicroH13:
         assert temps is not None
         assert temps["nvme"] == (42,)
 
-    def test_set_zone_speed_success(self, hw: SupermicroH13) -> None:
+    def test_get_temps_sensor_interval(self, hw: SupermicroH13) -> None:
+        """Interval-limited sensors are re-read only after their interval."""
+
+        class SlowSensor(_FakeSensor):
+            __slots__ = ()
+            min_interval_seconds: float = 60.0
+
+        hdd_sensor = SlowSensor({"hdd": (35.0,)})
+        hw._sensors[2] = hdd_sensor
+        with patch.object(_module.time, "monotonic", return_value=100.0):
+            _ = hw.get_temps()
+            temps = hw.get_temps()
+        assert temps is not None
+        assert temps["hdd"] == (35,)
+        assert hdd_sensor.calls == 1
+        with patch.object(_module.time, "monotonic", return_value=160.0):
+            _ = hw.get_temps()
+        assert hdd_sensor.calls == 2
+
+    def test_get_temps_repeat_calls_read_once(self, hw: SupermicroH13) -> None:
+        """Back-to-back reads within sensor_min_interval_seconds reuse results."""
+        hw.config.sensor_min_interval_seconds = 1.0
+        hw._sensors = _make_mock_sensors(hdd=(35.0,), nvme=(42.0,))
+        with patch.object(_module.time, "monotonic", return_value=100.0):
+            _ = hw.get_temps()
+            _ = hw.get_temps()
+        assert all(s.calls == 1 for s in hw._sensors)
+        with patch.object(_module.time, "monotonic", return_value=101.0):
+            _ = hw.get_temps()
+        assert all(s.calls == 2 for s in hw._sensors)
+
+    def test_get_temps_reads_sensors_concurrently(self, hw: SupermicroH13) -> None:
+        barrier = threading.Barrier(len(hw._sensors), timeout=5.0)
+
+        class BarrierSensor(_FakeSensor):
+            __slots__ = ()
+
+            def get(self) -> dict[str, tuple[float, ...] | None]:
+                _ = barrier.wait()  # Times out if sensors are read serially
+                return super().get()
+
+        hw._sensors = [BarrierSensor(s.result) for s in _make_mock_sensors()]
+        temps = hw.get_temps()
+        assert temps is not None
+        assert temps["cpu"] == (45,)
+
+    def test_close_shuts_down_sensor_pool(self, hw: SupermicroH13) -> None:
+        hw.close()
+        with pytest.raises(RuntimeError):
+            _ = hw.get_temps()
+
+    @pytest.mark.parametrize(
+        ("set_output", "expected"),
+        [
+            pytest.param("", True, id="success"),
+            pytest.param(None, False, id="failure"),  # Fail the set speed command
+        ],
+    )
+    def test_set_zone_speed(
+        self,
+        hw: SupermicroH13,
+        monkeypatch: pytest.MonkeyPatch,
+        set_output: str | None,
+        expected: bool,
+    ) -> None:
         def mockrun_cmd(cmd: list[str], _timeout: float = 5.0) -> str | None:
             if "0x45" in cmd and "0x00" in cmd:
                 return "01"  # Already in full mode
+            if "0x66" in cmd:
+                return set_output
             return ""
 
-        with patch.object(_module, "run_cmd", side_effect=mockrun_cmd):
-            result = hw.set_zone_speed(0, 50)
-        assert result is True
+        monkeypatch.setattr(_module, "run_cmd", mockrun_cmd)
+        assert hw.set_zone_speed(0, 50) is expected
 
-    def test_set_zone_speed_skips_if_unchanged(self, hw: SupermicroH13) -> None:
+    def test_set_zone_speed_skips_if_unchanged(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Setting same speed twice skips the IPMI call."""
         call_count = 0
 
@@ -632,56 +775,151 @@ class TestSupermicroH13:
                 return "01"
             return ""
 
-        with patch.object(_module, "run_cmd", side_effect=mockrun_cmd):
-            # First call should set speed
-            result1 = hw.set_zone_speed(0, 50)
-            assert result1 is True
-            assert call_count == 1
-            # Second call with same speed should skip
-            result2 = hw.set_zone_speed(0, 50)
-            assert result2 is True
-            assert call_count == 1  # No additional call
-
-    def test_set_zone_speed_failure(self, hw: SupermicroH13) -> None:
+        monkeypatch.setattr(_module, "run_cmd", mockrun_cmd)
+        # First call should set speed
+        result1 = hw.set_zone_speed(0, 50)
+        assert result1 is True
+        assert call_count == 1
+        # Second call with same speed should skip
+        result2 = hw.set_zone_speed(0, 50)
+        assert result2 is True
+        assert call_count == 1  # No additional call
+
+    def test_set_zone_speed_deadband(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Small changes within the deadband skip the IPMI call."""
+        calls: list[str] = []
+
         def mockrun_cmd(cmd: list[str], _timeout: float = 5.0) -> str | None:
-            if "0x45" in cmd and "0x00" in cmd:
-                return "01"  # Already in full mode
             if "0x66" in cmd:
-                return None  # Fail the set speed command
+                calls.append(cmd[-1])
             return ""
 
-        with patch.object(_module, "run_cmd", side_effect=mockrun_cmd):
-            result = hw.set_zone_speed(0, 50)
-        assert result is False
+        hw.config.speed_deadband_percent = 2
+        monkeypatch.setattr(_module, "run_cmd", mockrun_cmd)
+        assert hw.set_zone_speed(0, 50)
+        assert hw.set_zone_speed(0, 51)  # within deadband, skipped
+        assert hw.set_zone_speed(0, 52)  # at deadband, written
+        assert hw.set_zone_speed(0, 99)
+        assert hw.set_zone_speed(0, 100)  # full speed always written
+        assert calls == ["0x32", "0x34", "0x63", "0x64"]
+
+    def test_set_zone_speeds_batches_writes(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Multiple zone writes go through a single ipmitool exec."""
+        calls: list[tuple[list[str], str | None]] = []
+        speeds: dict[int, int] = {}
+        monkeypatch.setattr(_module, "run_cmd", _fake_bmc(calls, speeds))
+        assert hw.set_zone_speeds({0: 50, 1: 60})
+        assert hw.set_zone_speeds({0: 50, 1: 60})  # Unchanged, skipped
+        assert calls == [
+            (
+                ["ipmitool", "exec", "/dev/stdin"],
+                (
+                    "raw 0x30 0x70 0x66 0x01 0x00 0x32\n"
+                    "raw 0x30 0x70 0x66 0x01 0x01 0x3c\n"
+                ),
+            ),
+            (["ipmitool", "raw", "0x30", "0x70", "0x66", "0x00", "0x00"], None),
+            (["ipmitool", "raw", "0x30", "0x70", "0x66", "0x00", "0x01"], None),
+        ]
+        assert hw._last_set_speeds == [50, 60]
+
+    def test_set_zone_speeds_rewrites_unconfirmed_zone(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A zone the batch did not change is written again on its own."""
+        calls: list[tuple[list[str], str | None]] = []
+        speeds = {0: 30, 1: 30}
+        monkeypatch.setattr(_module, "run_cmd", _fake_bmc(calls, speeds, ignore=(0,)))
+        assert hw.set_zone_speeds({0: 50, 1: 60})
+        assert speeds == {0: 30, 1: 60}  # The fake BMC keeps ignoring zone 0
+        assert calls[-1] == (
+            ["ipmitool", "raw", "0x30", "0x70", "0x66", "0x01", "0x00", "0x32"],
+            None,
+        )
+        assert hw._last_set_speeds == [50, 60]
 
-    def test_set_fail_safe(self, hw: SupermicroH13) -> None:
+    def test_set_zone_speeds_exec_failure_writes_each_zone(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """If ipmitool exec fails, zones are written one at a time."""
+        calls: list[tuple[list[str], str | None]] = []
+        speeds: dict[int, int] = {}
+        monkeypatch.setattr(_module, "run_cmd", _fake_bmc(calls, speeds, exec_ok=False))
+        assert hw.set_zone_speeds({0: 50, 1: 60})
+        assert speeds == {0: 50, 1: 60}
+        assert [cmd[1] for cmd, _ in calls] == ["exec", "raw", "raw"]
+        assert hw._last_set_speeds == [50, 60]
+
+    def test_set_zone_speeds_single_write(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A single pending write uses the plain raw command."""
+        calls: list[list[str]] = []
+
+        def mockrun_cmd(cmd: list[str], _timeout: float = 5.0) -> str | None:
+            calls.append(cmd)
+            return ""
+
+        monkeypatch.setattr(_module, "run_cmd", mockrun_cmd)
+        assert hw.set_zone_speed(0, 50)
+        assert hw.set_zone_speeds({0: 50, 1: 60})
+        assert calls[-1] == [
+            "ipmitool",
+            "raw",
+            "0x30",
+            "0x70",
+            "0x66",
+            "0x01",
+            "0x01",
+            "0x3c",
+        ]
+        assert len(calls) == 2
+
+    def test_set_zone_speeds_failure(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(_module, "run_cmd", lambda *_a, **_k: None)
+        assert not hw.set_zone_speeds({0: 50, 1: 60})
+        assert hw._last_set_speeds == [None, None]
+
+    def test_set_fail_safe(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         def mockrun_cmd(cmd: list[str], _timeout: float = 5.0) -> str | None:
             if "0x45" in cmd and "0x00" in cmd:
                 return "01"  # Already in full mode
             return ""
 
-        with patch.object(_module, "run_cmd", side_effect=mockrun_cmd):
-            result = hw.set_fail_safe()
+        monkeypatch.setattr(_module, "run_cmd", mockrun_cmd)
+        result = hw.set_fail_safe()
         assert result is True
 
-    def test_initialize(self, hw: SupermicroH13) -> None:
+    def test_initialize(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         def mockrun_cmd(cmd: list[str], _timeout: float = 5.0) -> str | None:
             if "0x45" in cmd and "0x00" in cmd:
                 return "01"  # Already in full mode
             return ""
 
-        with patch.object(_module, "run_cmd", side_effect=mockrun_cmd):
-            result = hw.initialize()
+        monkeypatch.setattr(_module, "run_cmd", mockrun_cmd)
+        result = hw.initialize()
         assert result is True
 
     def test_get_zones(self, hw: SupermicroH13) -> None:
         assert hw.get_zones() == (0, 1)
 
-    def test_set_full_mode_needs_set(self, hw: SupermicroH13) -> None:
-        call_sequence: list[str] = []
+    def test_set_full_mode_needs_set(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        seen: set[tuple[str, ...]] = set()
 
         def mockrun_cmd(cmd: list[str], _timeout: float = 5.0) -> str | None:
-            call_sequence.append(" ".join(cmd))
+            seen.add(tuple(cmd))
             if "0x45" in cmd and "0x00" in cmd:
                 return "00"  # Not in full mode
             if "0x45" in cmd and "0x01" in cmd:
@@ -691,21 +929,22 @@ class TestSupermicroH13:
         def noop_sleep(_seconds: float) -> None:
             pass
 
-        with patch.object(_module, "run_cmd", side_effect=mockrun_cmd):
-            with patch.object(_module, "time") as mock_time:
-                mock_time.sleep = noop_sleep  # type: ignore[assignment]
-                result = hw._set_full_mode()
+        monkeypatch.setattr(_module, "run_cmd", mockrun_cmd)
+        monkeypatch.setattr(_module.time, "sleep", noop_sleep)
+        result = hw._set_full_mode()
         assert result is True
-        assert any("0x01 0x01" in c for c in call_sequence)
+        assert ("ipmitool", "raw", "0x30", "0x45", "0x01", "0x01") in seen
 
-    def test_set_full_mode_failure(self, hw: SupermicroH13) -> None:
+    def test_set_full_mode_failure(
+        self, hw: SupermicroH13, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         def mockrun_cmd(cmd: list[str], _timeout: float = 5.0) -> str | None:
             if "0x45" in cmd:
                 return None  # All mode commands fail
             return ""
 
-        with patch.object(_module, "run_cmd", side_effect=mockrun_cmd):
-            result = hw._set_full_mode()
+        monkeypatch.setattr(_module, "run_cmd", mockrun_cmd)
+        result = hw._set_full_mode()
         assert result is False
 
     def test_ipmi_temps_adds_ipmitool_sensor(self) -> None:
@@ -721,58 +960,70 @@ class TestSupermicroH13:
         assert "Ipmitool" not in sensor_types
 
 
+# from_args only reads the parser, so each one is built once per module
+@pytest.fixture(scope="module")
+def fan_speed_parser() -> argparse.ArgumentParser:
+    argparser = argparse.ArgumentParser()
+    FanSpeed.Config.add_args(argparser)
+    return argparser
+
+
+@pytest.fixture(scope="module")
+def h13_parser() -> argparse.ArgumentParser:
+    argparser = argparse.ArgumentParser()
+    SupermicroH13.Config.add_args(argparser)
+    return argparser
+
+
+@pytest.fixture(scope="module")
+def daemon_parser() -> argparse.ArgumentParser:
+    argparser = argparse.ArgumentParser()
+    FanDaemon.Config.add_args(argparser)
+    return argparser
+
+
 class TestConfigFromArgs:
     """Tests for Config.from_args methods."""
 
-    def test_fan_speed_config_from_args(self) -> None:
-        import argparse
-
-        argparser = argparse.ArgumentParser()
-        FanSpeed.Config.add_args(argparser)
-        args = argparser.parse_args(
+    def test_fan_speed_config_from_args(
+        self, fan_speed_parser: argparse.ArgumentParser
+    ) -> None:
+        args = fan_speed_parser.parse_args(
             ["--speeds", "gpu=50:20,80:100", "--hysteresis_celsius", "3"]
         )
-        config = FanSpeed.Config.from_args(argparser, args)
+        config = FanSpeed.Config.from_args(fan_speed_parser, args)
         assert config.hysteresis_celsius == 3.0
         assert ("gpu", -1, -1) in config.speeds
 
-    def test_fan_speed_config_from_args_no_speeds(self) -> None:
-        import argparse
-
-        argparser = argparse.ArgumentParser()
-        FanSpeed.Config.add_args(argparser)
-        args = argparser.parse_args([])
-        config = FanSpeed.Config.from_args(argparser, args)
+    def test_fan_speed_config_from_args_no_speeds(
+        self, fan_speed_parser: argparse.ArgumentParser
+    ) -> None:
+        args = fan_speed_parser.parse_args([])
+        config = FanSpeed.Config.from_args(fan_speed_parser, args)
         assert config.hysteresis_celsius == 5.0  # default
 
-    def test_supermicro_h13_config_from_args(self) -> None:
-        import argparse
-
-        argparser = argparse.ArgumentParser()
-        SupermicroH13.Config.add_args(argparser)
-        args = argparser.parse_args([])
-        config = SupermicroH13.Config.from_args(argparser, args)
+    def test_supermicro_h13_config_from_args(
+        self, h13_parser: argparse.ArgumentParser
+    ) -> None:
+        args = h13_parser.parse_args([])
+        config = SupermicroH13.Config.from_args(h13_parser, args)
         assert config.zones == (0, 1)
 
-    def test_fan_daemon_config_from_args(self) -> None:
-        import argparse
-
-        argparser = argparse.ArgumentParser()
-        FanDaemon.Config.add_args(argparser)
-        args = argparser.parse_args(
+    def test_fan_daemon_config_from_args(
+        self, daemon_parser: argparse.ArgumentParser
+    ) -> None:
+        args = daemon_parser.parse_args(
             ["--interval_seconds", "10", "--heartbeat_seconds", "60"]
         )
-        config = FanDaemon.Config.from_args(argparser, args)
+        config = FanDaemon.Config.from_args(daemon_parser, args)
         assert config.interval_seconds == 10.0
         assert config.heartbeat_seconds == 60.0
 
-    def test_fan_daemon_config_from_args_defaults(self) -> None:
-        import argparse
-
-        argparser = argparse.ArgumentParser()
-        FanDaemon.Config.add_args(argparser)
-        args = argparser.parse_args([])
-        config = FanDaemon.Config.from_args(argparser, args)
+    def test_fan_daemon_config_from_args_defaults(
+        self, daemon_parser: argparse.ArgumentParser
+    ) -> None:
+        args = daemon_parser.parse_args([])
+        config = FanDaemon.Config.from_args(daemon_parser, args)
         assert config.interval_seconds == 5.0
         assert config.heartbeat_seconds == 30.0
 
@@ -780,51 +1031,72 @@ class TestConfigFromArgs:
 class TestUtilityFunctions:
     """Tests for module-level utility functions."""
 
-    def testrun_cmd_success(self) -> None:
-        result = run_cmd(["echo", "hello"])
-        assert result == "hello\n"
-
-    def testrun_cmd_failure(self) -> None:
-        result = run_cmd(["false"])
-        assert result is None
-
-    def testrun_cmd_timeout(self) -> None:
-        result = run_cmd(["sleep", "10"], timeout=0.1)
-        assert result is None
-
-    def testrun_cmd_not_found(self) -> None:
-        result = run_cmd(["nonexistent_command_12345"])
-        assert result is None
+    # run_cmd's real subprocess behavior is covered by sensors_test.TestRunCmd;
+    # here subprocess.run is faked so no process is spawned
+    @pytest.fixture
+    def mock_subprocess_run(self) -> Iterator[MagicMock]:
+        with patch.object(_module.sensors.subprocess, "run") as mock_run:
+            yield mock_run
+
+    @pytest.mark.parametrize(
+        ("outcome", "expected"),
+        [
+            pytest.param(
+                subprocess.CompletedProcess(["cmd"], 0, stdout="hello\n"),
+                "hello\n",
+                id="success",
+            ),
+            pytest.param(
+                subprocess.CompletedProcess(["cmd"], 1, stdout=""), None, id="failure"
+            ),
+            pytest.param(subprocess.TimeoutExpired(["cmd"], 0.1), None, id="timeout"),
+            pytest.param(FileNotFoundError("cmd"), None, id="not_found"),
+        ],
+    )
+    def test_run_cmd(
+        self,
+        mock_subprocess_run: MagicMock,
+        outcome: subprocess.CompletedProcess[str] | Exception,
+        expected: str | None,
+    ) -> None:
+        if isinstance(outcome, Exception):
+            mock_subprocess_run.side_effect = outcome
+        else:
+            mock_subprocess_run.return_value = outcome
+        assert run_cmd(["cmd", "arg"], timeout=0.1) == expected
+        mock_subprocess_run.assert_called_once()
+        assert mock_subprocess_run.call_args.args == (["cmd", "arg"],)
+        assert mock_subprocess_run.call_args.kwargs["timeout"] == 0.1
 
 
 class TestFanDaemonLifecycle:
     """Tests for FanDaemon run/shutdown lifecycle."""
 
-    def test_format_status(self) -> None:
-        hardware = MockHardware()
-        fan_speed = FanSpeed.Config().setup()
-        daemon = FanDaemon.Config().setup(hardware, fan_speed)
-
+    def test_format_status(self, daemon: FanDaemon) -> None:
         # (speed, trigger, temp)
         zone_speeds = {0: (50, "GPU0", 70), 1: (30, "CPU0", 45)}
         temps = {"cpu": (45,), "gpu": (70,), "ram": None}
 
         status = daemon._format_status(zone_speeds, temps)
-        # Check zone summary line
-        assert "z0=50%" in status
-        assert "z1=30%" in status
-        # Check device lines with temps
-        assert "cpu0" in status
-        assert "45C" in status
-        assert "gpu0" in status
-        assert "70C" in status
-        # Check winner markers
-        assert "<-- z0" in status
-        assert "<-- z1" in status
-
-    def test_format_status_with_informational_sensors(self) -> None:
+        expected = (
+            # Zone summary line
+            "z0=50%",
+            "z1=30%",
+            # Device lines with temps
+            "cpu0",
+            "45C",
+            "gpu0",
+            "70C",
+            # Winner markers
+            "<-- z0",
+            "<-- z1",
+        )
+        _assert_all_in(expected, status)
+
+    def test_format_status_with_informational_sensors(
+        self, hardware: MockHardware
+    ) -> None:
         """Sensors without speed curves (gpu_ipmi, vrm_cpu) appear in output."""
-        hardware = MockHardware()
         # Only gpu has a curve in defaults, gpu_ipmi and vrm_cpu don't
         fan_speed = FanSpeed.Config(
             speeds={
@@ -838,91 +1110,159 @@ class TestFanDaemonLifecycle:
         temps = {"gpu": (70,), "gpu_ipmi": (72,), "vrm_cpu": (45,)}
 
         status = daemon._format_status(zone_speeds, temps)
-        # Devices with curves show zone contributions
-        assert "gpu0" in status
-        assert "70C" in status
-        # Devices without curves still appear (informational)
-        assert "gpu_ipmi0" in status
-        assert "72C" in status
-        assert "vrm_cpu0" in status
-        assert "45C" in status
-
-    def test_heartbeat_logging(self) -> None:
-        hardware = MockHardware()
-        fan_speed = FanSpeed.Config().setup()
+        expected = (
+            # Devices with curves show zone contributions
+            "gpu0",
+            "70C",
+            # Devices without curves still appear (informational)
+            "gpu_ipmi0",
+            "72C",
+            "vrm_cpu0",
+            "45C",
+        )
+        _assert_all_in(expected, status)
+
+    def test_heartbeat_logging(
+        self, hardware: MockHardware, default_fan_speed: FanSpeed
+    ) -> None:
         config = FanDaemon.Config(heartbeat_seconds=0.01)
-        daemon = config.setup(hardware, fan_speed)
+        daemon = config.setup(hardware, default_fan_speed)
+        clock = [100.0]
 
-        # First call logs and sets heartbeat
-        daemon.control_loop()
-        first_heartbeat = daemon.last_heartbeat
+        with patch.object(_module, "time") as mock_time:
+            mock_time.time.side_effect = lambda: clock[0]
 
-        # Second call with same speeds - no log (speeds unchanged, heartbeat not due)
-        daemon.control_loop()
+            # First call logs and sets heartbeat
+            daemon.control_loop()
+            first_heartbeat = daemon.last_heartbeat
 
-        # Wait for heartbeat interval
-        import time
+            # Second call with same speeds - no log (speeds unchanged, heartbeat
+            # not due)
+            daemon.control_loop()
 
-        time.sleep(0.02)
+            # Advance past the heartbeat interval
+            clock[0] += 0.05
 
-        # Third call should trigger heartbeat log
-        daemon.control_loop()
+            # Third call should trigger heartbeat log
+            daemon.control_loop()
         assert daemon.last_heartbeat > first_heartbeat
 
-    def test_shutdown(self) -> None:
-        hardware = MockHardware()
-        fan_speed = FanSpeed.Config().setup()
-        daemon = FanDaemon.Config().setup(hardware, fan_speed)
+    def test_status_not_formatted_when_not_logged(
+        self, hardware: MockHardware, default_fan_speed: FanSpeed
+    ) -> None:
+        """Steady-state ticks skip status formatting unless DEBUG is enabled."""
+        config = FanDaemon.Config(heartbeat_seconds=0.0)
+        daemon = config.setup(hardware, default_fan_speed)
+
+        # First call logs the speed change
+        daemon.control_loop()
+
+        calls = 0
+        format_status = daemon._format_status
+
+        def counting_format_status(*args: object) -> str:
+            nonlocal calls
+            calls += 1
+            return format_status(*args)  # type: ignore[arg-type]
+
+        daemon._format_status = counting_format_status  # type: ignore[method-assign]
+        with patch.object(_module.log, "isEnabledFor", return_value=False):
+            daemon.control_loop()
+        assert calls == 0
 
-        with pytest.raises(SystemExit):
+    def test_status_not_formatted_when_info_disabled(
+        self, hardware: MockHardware, default_fan_speed: FanSpeed
+    ) -> None:
+        """Speed changes and heartbeats skip formatting when INFO is disabled."""
+        config = FanDaemon.Config(heartbeat_seconds=0.01)
+        daemon = config.setup(hardware, default_fan_speed)
+
+        calls = 0
+        format_status = daemon._format_status
+
+        def counting_format_status(*args: object) -> str:
+            nonlocal calls
+            calls += 1
+            return format_status(*args)  # type: ignore[arg-type]
+
+        daemon._format_status = counting_format_status  # type: ignore[method-assign]
+        clock = [100.0]
+        with (
+            patch.object(_module.log, "isEnabledFor", return_value=False),
+            patch.object(_module, "time") as mock_time,
+        ):
+            mock_time.time.side_effect = lambda: clock[0]
+            daemon.control_loop()  # Speed change
+            clock[0] += 0.05
+            daemon.control_loop()  # Heartbeat
+        assert calls == 0
+        assert daemon.last_logged_speeds
+        assert daemon.last_heartbeat == clock[0]
+
+    def test_shutdown(self, daemon: FanDaemon) -> None:
+        daemon.running = True
+        daemon.shutdown(signum=15)
+        assert not daemon.running
+        assert daemon._stop_event.is_set()
+
+    @pytest.mark.usefixtures("no_signal_handlers")
+    def test_shutdown_wakes_run_and_sets_fail_safe(
+        self, hardware: MockHardware, default_fan_speed: FanSpeed
+    ) -> None:
+        config = FanDaemon.Config(interval_seconds=60.0)
+        daemon = config.setup(hardware, default_fan_speed)
+
+        # Shutdown during the first tick; the 60s wait must return immediately
+        def control_loop() -> None:
             daemon.shutdown(signum=15)
+
+        daemon.control_loop = control_loop  # type: ignore[method-assign]
+        start = time.monotonic()
+        daemon.run()
+        assert time.monotonic() - start < 5.0
         assert hardware.fail_safe_called
 
 
 class TestFromArgsErrors:
     """Tests for from_args error paths."""
 
-    def test_fan_speed_config_from_args_invalid_speeds(self) -> None:
+    def test_fan_speed_config_from_args_invalid_speeds(
+        self, fan_speed_parser: argparse.ArgumentParser
+    ) -> None:
         """Test from_args with invalid speeds spec triggers argparser.error."""
-        import argparse
-
-        argparser = argparse.ArgumentParser()
-        FanSpeed.Config.add_args(argparser)
         # Use invalid spec that will cause _parse_speeds to raise ValueError
-        args = argparser.parse_args(["--speeds", "invalid"])
+        args = fan_speed_parser.parse_args(["--speeds", "invalid"])
 
         with pytest.raises(SystemExit):  # argparser.error() calls sys.exit
-            FanSpeed.Config.from_args(argparser, args)
+            FanSpeed.Config.from_args(fan_speed_parser, args)
 
-    def test_fan_daemon_config_from_args_interval_zero(self) -> None:
+    @pytest.mark.parametrize("val", ["0", "-5"], ids=["zero", "negative"])
+    def test_fan_daemon_config_from_args_interval(
+        self, daemon_parser: argparse.ArgumentParser, val: str
+    ) -> None:
         """Test from_args with interval_seconds <= 0 triggers argparser.error."""
-        import argparse
-
-        argparser = argparse.ArgumentParser()
-        FanDaemon.Config.add_args(argparser)
-        args = argparser.parse_args(["--interval_seconds", "0"])
-
-        with pytest.raises(SystemExit):  # argparser.error() calls sys.exit
-            FanDaemon.Config.from_args(argparser, args)
-
-    def test_fan_daemon_config_from_args_interval_negative(self) -> None:
-        """Test from_args with negative interval_seconds triggers argparser.error."""
-        import argparse
-
-        argparser = argparse.ArgumentParser()
-        FanDaemon.Config.add_args(argparser)
-        args = argparser.parse_args(["--interval_seconds", "-5"])
+        args = daemon_parser.parse_args(["--interval_seconds", val])
 
         with pytest.raises(SystemExit):  # argparser.error() calls sys.exit
-            FanDaemon.Config.from_args(argparser, args)
+            FanDaemon.Config.from_args(daemon_parser, args)
 
 
+@pytest.mark.usefixtures("no_signal_handlers")
 class TestFanDaemonRun:
     """Tests for FanDaemon.run() method."""
 
-    def test_run_calls_initialize(self) -> None:
+    @pytest.fixture
+    def fake_time(self) -> Iterator[MagicMock]:
+        """Patch the daemon's time module with a clock stuck at 0."""
+        with patch.object(_module, "time") as mock_time:
+            mock_time.time.return_value = 0.0
+            yield mock_time
+
+    @pytest.mark.usefixtures("fake_time")
+    def test_run_calls_initialize(
+        self, hardware: MockHardware, daemon: FanDaemon
+    ) -> None:
         """Test that run() calls hardware.initialize()."""
-        hardware = MockHardware()
         initialized = []
 
         def mock_initialize() -> bool:
@@ -931,26 +1271,22 @@ class TestFanDaemonRun:
 
         hardware.initialize = mock_initialize  # type: ignore[method-assign]
 
-        fan_speed = FanSpeed.Config().setup()
-        daemon = FanDaemon.Config().setup(hardware, fan_speed)
-
         # Stop after one loop iteration
-        def stop_after_one_iteration(_seconds: float) -> None:
-            daemon.running = False
+        def stop_after_one_iteration(_seconds: float) -> bool:
+            daemon.shutdown(signum=15)
+            return False
 
-        with patch.object(_module, "time") as mock_time:
-            mock_time.sleep.side_effect = stop_after_one_iteration
-            mock_time.time.return_value = 0.0
+        stop = stop_after_one_iteration
+        with patch.object(daemon._stop_event, "wait", side_effect=stop):
             daemon.run()
 
         assert len(initialized) == 1
 
-    def test_run_control_loop_exception_sets_fail_safe(self) -> None:
+    @pytest.mark.usefixtures("fake_time")
+    def test_run_control_loop_exception_sets_fail_safe(
+        self, hardware: MockHardware, daemon: FanDaemon
+    ) -> None:
         """Test that exceptions in control_loop trigger fail-safe."""
-        hardware = MockHardware()
-        fan_speed = FanSpeed.Config().setup()
-        daemon = FanDaemon.Config().setup(hardware, fan_speed)
-
         call_count = 0
 
         def mock_control_loop() -> None:
@@ -958,61 +1294,75 @@ class TestFanDaemonRun:
             call_count += 1
             if call_count == 1:
                 raise RuntimeError("Test error")
-            daemon.running = False
+            daemon.shutdown(signum=15)
 
         daemon.control_loop = mock_control_loop  # type: ignore[method-assign]
 
-        with patch.object(_module, "time") as mock_time:
-            mock_time.sleep.return_value = None
-            mock_time.time.return_value = 0.0
+        with patch.object(daemon._stop_event, "wait", return_value=False):
             daemon.run()
 
         assert hardware.fail_safe_called
 
-    def test_run_sets_fail_safe_on_exit(self) -> None:
+    @pytest.mark.usefixtures("fake_time")
+    def test_run_sets_fail_safe_on_exit(
+        self, hardware: MockHardware, daemon: FanDaemon
+    ) -> None:
         """Test that run() sets fail-safe when exiting normally."""
-        hardware = MockHardware()
-        fan_speed = FanSpeed.Config().setup()
-        daemon = FanDaemon.Config().setup(hardware, fan_speed)
 
         # Stop immediately
-        def stop_immediately(_seconds: float) -> None:
-            daemon.running = False
+        def stop_immediately(_seconds: float) -> bool:
+            daemon.shutdown(signum=15)
+            return False
 
-        with patch.object(_module, "time") as mock_time:
-            mock_time.sleep.side_effect = stop_immediately
-            mock_time.time.return_value = 0.0
+        with patch.object(daemon._stop_event, "wait", side_effect=stop_immediately):
             daemon.run()
 
         assert hardware.fail_safe_called
+        assert hardware.closed
+
+    def test_run_shutdown_during_startup_skips_loop(
+        self, hardware: MockHardware, daemon: FanDaemon
+    ) -> None:
+        """A signal while initialize() waits ends run() without any tick."""
+
+        def initialize() -> bool:
+            daemon.shutdown(signum=15)
+            return True
+
+        def control_loop() -> None:
+            pytest.fail("control_loop ran after shutdown")
+
+        hardware.initialize = initialize  # type: ignore[method-assign]
+        daemon.control_loop = control_loop  # type: ignore[method-assign]
+        daemon.run()
+        assert not daemon.running
+        assert hardware.fail_safe_called
 
-    def test_run_exits_if_initialize_fails(self) -> None:
+    def test_run_exits_if_initialize_fails(
+        self, hardware: MockHardware, daemon: FanDaemon
+    ) -> None:
         """Test that run() exits with code 1 if hardware.initialize() fails."""
-        hardware = MockHardware()
         hardware.initialize = lambda: False  # type: ignore[method-assign]
 
-        fan_speed = FanSpeed.Config().setup()
-        daemon = FanDaemon.Config().setup(hardware, fan_speed)
-
         with pytest.raises(SystemExit) as exc_info:
             daemon.run()
         assert exc_info.value.code == 1
+        assert hardware.closed
 
-    def test_run_exits_if_get_temps_fails_at_startup(self) -> None:
+    def test_run_exits_if_get_temps_fails_at_startup(
+        self, hardware: MockHardware, daemon: FanDaemon
+    ) -> None:
         """Test that run() exits with code 1 if initial get_temps() returns None."""
-        hardware = MockHardware()
         hardware.get_temps = lambda: None  # type: ignore[method-assign]
 
-        fan_speed = FanSpeed.Config().setup()
-        daemon = FanDaemon.Config().setup(hardware, fan_speed)
-
         with pytest.raises(SystemExit) as exc_info:
             daemon.run()
         assert exc_info.value.code == 1
 
-    def test_run_exits_if_mapping_references_missing_sensor(self) -> None:
+    def test_run_exits_if_mapping_references_missing_sensor(
+        self, hardware: MockHardware
+    ) -> None:
         """Test that run() exits if speed mapping references non-existent sensor."""
-        hardware = MockHardware()
         # Hardware only returns cpu temps, but we have a mapping for "nonexistent"
         hardware.get_temps = lambda: {"cpu": (45,)}  # type: ignore[method-assign]
 
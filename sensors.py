@@ -5,16 +5,38 @@ Each sensor implements get() -> dict[str, tuple[float, ...] | None]
 
 from __future__ import annotations
 
+import atexit
+import concurrent.futures
 import logging
+import os
 import pathlib
+import re
+import shutil
 import subprocess
+import time
+from types import ModuleType
 from typing import Protocol
 
+pynvml: ModuleType | None
+try:
+    import pynvml  # pyright: ignore[reportMissingImports]  # nvidia-ml-py, optional
+except ImportError:
+    pynvml = None
+
 log = logging.getLogger("fan-daemon")
 
 # Type alias for sensor return values
 SensorResult = dict[str, tuple[float, ...] | None]
 
+# smartctl -A attribute rows carrying a temperature (RAW_VALUE is column 10)
+_SMARTCTL_TEMP_RE = re.compile(
+    r"^.*(?:Temperature_Celsius|Airflow_Temperature).*$", re.MULTILINE
+)
+# nvme smart-log value of "temperature ... : 42 C" rows
+_NVME_TEMP_RE = re.compile(
+    r"^\s*temperature[^:\n]*:[ \t]*(\S*)", re.IGNORECASE | re.MULTILINE
+)
+
 
 class Sensor(Protocol):
     """Protocol for temperature sensors."""
@@ -29,6 +51,7 @@ class K10Temp:
 
     def __init__(self) -> None:
         self._hwmon_path: pathlib.Path | None = None
+        self._inputs: tuple[pathlib.Path, ...] | None = None  # Found on first get
         for hwmon in pathlib.Path("/sys/class/hwmon").iterdir():
             name_file = hwmon / "name"
             if name_file.exists() and name_file.read_text().strip() == "k10temp":
@@ -42,8 +65,12 @@ class K10Temp:
         if self._hwmon_path is None:
             return {"cpu": None}
 
+        # The set of temp inputs is fixed by the driver, so glob only once
+        if self._inputs is None:
+            self._inputs = tuple(sorted(self._hwmon_path.glob("temp*_input")))
+
         temps: list[float] = []
-        for temp_input in sorted(self._hwmon_path.glob("temp*_input")):
+        for temp_input in self._inputs:
             try:
                 millidegrees = int(temp_input.read_text().strip())
                 temp = _valid_temp(millidegrees / 1000.0)
@@ -69,24 +96,228 @@ class Nvidiasmi:
         )
         if out is None:
             return {"gpu": None}
+        return {"gpu": _parse_gpu_temps(out.strip().splitlines())}
+
+
+class NvidiasmiLoop:
+    """NVIDIA GPU temperature sensor via a long-lived `nvidia-smi -lms` child.
+
+    The child keeps the driver open and prints one "index, temp" line per GPU
+    every period; get() drains its pipe and parses the newest complete sample,
+    so there is no fork/exec per read. Lines are keyed by GPU index and any
+    other output is skipped, so a stray line cannot shift later samples. A
+    one-shot nvidia-smi read is used to learn the GPU count and whenever the
+    child is (re)started.
+    """
+
+    def __init__(self, period_ms: int = 1000) -> None:
+        self._period_ms = period_ms
+        self._stale_seconds = max(5.0, 3 * period_ms / 1000)
+        self._oneshot = Nvidiasmi()
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._buf = b""  # Partial line
+        self._pending: dict[int, str] = {}  # GPU index -> temp, partial sample
+        self._num_gpus = 0
+        self._last: SensorResult = {"gpu": None}
+        self._last_time = 0.0
+        _ = atexit.register(self._stop)
+
+    def get(self) -> SensorResult:
+        """Read GPU temps from the newest sample streamed by nvidia-smi."""
+        now = time.monotonic()
+        if self._proc is not None and self._proc.poll() is None:
+            lines = self._drain()
+            if lines is not None:
+                for line in lines:
+                    index, sep, temp = line.partition(",")
+                    if not sep or not index.isdigit():
+                        continue  # Not a sample row, e.g. a driver message
+                    gpu = int(index)
+                    if gpu >= self._num_gpus:
+                        continue
+                    self._pending[gpu] = temp
+                    if len(self._pending) == self._num_gpus:
+                        sample = [self._pending[i] for i in range(self._num_gpus)]
+                        self._last = {"gpu": _parse_gpu_temps(sample)}
+                        self._last_time = now
+                        self._pending = {}
+                if now - self._last_time < self._stale_seconds:
+                    return self._last
+            log.warning("nvidia-smi stream stalled or exited, restarting")
+            self._stop()
+
+        # (Re)start the stream; one-shot read gives GPU count and a fresh value
+        result = self._oneshot.get()
+        if gpus := result["gpu"]:
+            self._num_gpus = len(gpus)
+            self._last = result
+            self._last_time = now
+            self._start()
+        return result
+
+    def _start(self) -> None:
+        try:
+            self._proc = subprocess.Popen(
+                [
+                    "nvidia-smi",
+                    "--query-gpu=index,temperature.gpu",
+                    "--format=csv,noheader,nounits",
+                    f"--loop-ms={self._period_ms}",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            self._proc = None
+            return
+        assert self._proc.stdout is not None
+        os.set_blocking(self._proc.stdout.fileno(), False)
+
+    def _stop(self) -> None:
+        if self._proc is not None:
+            self._proc.kill()
+            _ = self._proc.wait()
+            if self._proc.stdout is not None:
+                self._proc.stdout.close()
+            self._proc = None
+        self._buf = b""
+        self._pending = {}
+
+    def _drain(self) -> list[str] | None:
+        """Return complete lines available on the pipe, None on EOF."""
+        assert self._proc is not None and self._proc.stdout is not None
+        fd = self._proc.stdout.fileno()
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                return None
+            self._buf += chunk
+        *lines, self._buf = self._buf.split(b"\n")
+        return [s for line in lines if (s := line.decode().strip())]
+
 
+class Nvml:
+    """NVIDIA GPU temperature sensor via NVML (nvidia-ml-py).
+
+    Queries the driver in-process, avoiding a fork/exec of nvidia-smi (and its
+    CSV parsing) every tick. NVML and the device handles are set up once.
+    """
+
+    _handles: tuple[object, ...]
+
+    def __init__(self) -> None:
+        """Initialize NVML. Raises pynvml.NVMLError if the driver is unusable."""
+        assert pynvml is not None
+        pynvml.nvmlInit()
+        self._handles = tuple(
+            pynvml.nvmlDeviceGetHandleByIndex(i)
+            for i in range(pynvml.nvmlDeviceGetCount())
+        )
+
+    def get(self) -> SensorResult:
+        """Read GPU temps from NVML."""
+        assert pynvml is not None
         temps: list[float] = []
-        for line in out.strip().splitlines():
+        for handle in self._handles:
             try:
-                temp = _valid_temp(float(line.strip()))
-                if temp is not None:
-                    temps.append(temp)
-                else:
-                    return {"gpu": None}
-            except ValueError:
+                temp = _valid_temp(
+                    float(
+                        pynvml.nvmlDeviceGetTemperature(
+                            handle, pynvml.NVML_TEMPERATURE_GPU
+                        )
+                    )
+                )
+            except pynvml.NVMLError:
                 return {"gpu": None}
+            if temp is None:
+                return {"gpu": None}
+            temps.append(temp)
 
         return {"gpu": tuple(temps) if temps else None}
 
 
+class Amdgpu:
+    """AMD GPU temperature sensor via amdgpu hwmon (edge temp, no subprocess)."""
+
+    _inputs: tuple[pathlib.Path, ...]
+
+    def __init__(self) -> None:
+        # Auto-detect cards; temp1_input is the edge (die) temperature. Other DRM
+        # drivers (e.g. nouveau) expose the same layout, so match the hwmon name
+        inputs = pathlib.Path("/sys/class/drm").glob(
+            "card*/device/hwmon/hwmon*/temp1_input"
+        )
+        self._inputs = tuple(
+            sorted(p for p in inputs if _hwmon_name(p.parent) == "amdgpu")
+        )
+        if self._inputs:
+            log.info("AMD GPUs: %d", len(self._inputs))
+
+    @property
+    def found(self) -> bool:
+        """True if any amdgpu card was detected."""
+        return bool(self._inputs)
+
+    def get(self) -> SensorResult:
+        """Read GPU temps from amdgpu hwmon."""
+        temps: list[float] = []
+        for temp_input in self._inputs:
+            try:
+                temp = _valid_temp(int(temp_input.read_text().strip()) / 1000.0)
+            except (ValueError, OSError):
+                return {"gpu": None}
+            if temp is None:
+                return {"gpu": None}
+            temps.append(temp)
+
+        return {"gpu": tuple(temps) if temps else None}
+
+
+def gpu_sensor(nvidia_smi_loop_ms: int = 0) -> Sensor:
+    """Return NVML GPU sensor if available, else amdgpu hwmon, else nvidia-smi.
+
+    Without pynvml, a host with both amdgpu and NVIDIA cards reads only the
+    amdgpu ones (a warning is logged if nvidia-smi is installed); install
+    pynvml (or use --ipmi-temps) to cover NVIDIA GPUs.
+
+    Args:
+        nvidia_smi_loop_ms: If > 0, the nvidia-smi fallback streams samples
+            from one long-lived child at this period instead of running
+            nvidia-smi on every read.
+    """
+    nvml_error: Exception | None = None
+    if pynvml is not None:
+        try:
+            return Nvml()
+        except pynvml.NVMLError as e:
+            nvml_error = e
+    amdgpu = Amdgpu()
+    if amdgpu.found:
+        if nvml_error is not None:
+            log.warning("NVML unavailable (%s), using amdgpu hwmon", nvml_error)
+        if shutil.which("nvidia-smi") is not None:
+            log.warning(
+                "nvidia-smi found but using amdgpu hwmon; NVIDIA GPUs are not "
+                "monitored without NVML"
+            )
+        return amdgpu
+    if nvml_error is not None:
+        log.warning("NVML unavailable (%s), using nvidia-smi", nvml_error)
+    if nvidia_smi_loop_ms > 0:
+        return NvidiasmiLoop(nvidia_smi_loop_ms)
+    return Nvidiasmi()
+
+
 class Smartctl:
     """HDD temperature sensor via smartctl."""
 
+    # Disk temps move slowly and smartctl spawns one process per device, so
+    # callers should reuse a reading for this long
+    min_interval_seconds: float = 60.0
+
     _devices: tuple[str, ...]
 
     def __init__(self) -> None:
@@ -101,6 +332,10 @@ class Smartctl:
         self._devices = tuple(sorted(hdds))
         if self._devices:
             log.info("HDDs: %s", ", ".join(self._devices))
+        # Threads start on first use and are reused by every get()
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, len(self._devices)), thread_name_prefix="smartctl"
+        )
 
     def get(self) -> SensorResult:
         """Read HDD temps via smartctl."""
@@ -108,18 +343,15 @@ class Smartctl:
             return {"hdd": None}
 
         temps: list[float] = []
-        for dev in self._devices:
-            out = run_cmd(["smartctl", "-A", dev])
+        outs = _run_cmds(self._pool, [["smartctl", "-A", dev] for dev in self._devices])
+        for dev, out in zip(self._devices, outs):
             if out is None:
                 log.warning("Failed to read HDD temp from %s", dev)
                 continue
-            for line in out.splitlines():
-                if (
-                    "Temperature_Celsius" not in line
-                    and "Airflow_Temperature" not in line
-                ):
-                    continue
-                parts = line.split()
+            # Regex finds the few temperature rows without a Python-level
+            # scan of every attribute line
+            for m in _SMARTCTL_TEMP_RE.finditer(out):
+                parts = m.group().split()
                 if len(parts) < 10:
                     continue
                 try:
@@ -135,6 +367,10 @@ class Smartctl:
 class Nvmecli:
     """NVMe temperature sensor via nvme-cli."""
 
+    # NVMe temps move slowly and nvme-cli spawns one process per device, so
+    # callers should reuse a reading for this long
+    min_interval_seconds: float = 10.0
+
     _devices: tuple[str, ...]
 
     def __init__(self) -> None:
@@ -145,6 +381,10 @@ class Nvmecli:
         self._devices = tuple(sorted(nvmes))
         if self._devices:
             log.info("NVMe: %s", ", ".join(self._devices))
+        # Threads start on first use and are reused by every get()
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, len(self._devices)), thread_name_prefix="nvme"
+        )
 
     def get(self) -> SensorResult:
         """Read NVMe temps via nvme-cli."""
@@ -152,25 +392,20 @@ class Nvmecli:
             return {"nvme": None}
 
         temps: list[float] = []
-        for dev in self._devices:
-            out = run_cmd(["nvme", "smart-log", dev])
+        outs = _run_cmds(
+            self._pool, [["nvme", "smart-log", dev] for dev in self._devices]
+        )
+        for dev, out in zip(self._devices, outs):
             if out is None:
                 log.warning("Failed to read NVMe temp from %s", dev)
                 continue
-            for line in out.splitlines():
-                if not line.strip().lower().startswith("temperature"):
-                    continue
-                parts = line.split(":")
-                if len(parts) < 2:
-                    continue
+            for m in _NVME_TEMP_RE.finditer(out):
                 try:
-                    temp = _valid_temp(
-                        float(parts[1].strip().split()[0].replace(",", ""))
-                    )
+                    temp = _valid_temp(float(m.group(1).replace(",", "")))
                     if temp is not None:
                         temps.append(temp)
                         break  # Only first temperature line per device
-                except (ValueError, IndexError):
+                except ValueError:
                     pass
 
         return {"nvme": tuple(temps) if temps else None}
@@ -191,10 +426,16 @@ class Ipmitool:
         self._sensor_map = sensor_map
 
     def get(self) -> SensorResult:
-        """Read temps from ipmitool sensor."""
-        out = run_cmd(["ipmitool", "sensor"])
+        """Read temps from one ipmitool SDR dump.
+
+        `ipmitool sdr type temperature` reads only temperature sensor records,
+        whereas `ipmitool sensor` also fetches thresholds for every sensor
+        (several extra BMC transactions each) and `sdr elist full` also reads
+        fans, voltages and power.
+        """
+        out = run_cmd(["ipmitool", "sdr", "type", "temperature"])
         if out is None:
-            log.error("Failed to run ipmitool sensor")
+            log.error("Failed to run ipmitool sdr")
             keys = set(self._sensor_map.values())
             return {k: None for k in keys}
 
@@ -203,34 +444,87 @@ class Ipmitool:
         for key in set(self._sensor_map.values()):
             temps[key] = []
 
+        # Lines look like: "CPU Temp | 01h | ok | 3.1 | 45 degrees C"
         for line in out.splitlines():
             parts = line.split("|")
-            if len(parts) < 2:
+            if len(parts) < 5:
                 continue
             sensor_name = parts[0].strip()
             if sensor_name not in self._sensor_map:
                 continue
             key = self._sensor_map[sensor_name]
-            value_str = parts[1].strip()
+            value_str = parts[4].strip().split(" ", 1)[0]
             try:
                 temp = _valid_temp(float(value_str))
                 if temp is not None:
                     temps[key].append(temp)
             except ValueError:
-                pass  # "na" or other non-numeric
+                pass  # "No Reading", "Disabled" or other non-numeric
 
         return {k: tuple(v) if v else None for k, v in temps.items()}
 
 
-def run_cmd(cmd: list[str], timeout: float = 5.0) -> str | None:
-    """Run command with timeout. Returns stdout on success, None on failure."""
+def run_cmd(
+    cmd: list[str],
+    timeout: float = 5.0,
+    stdin: str | None = None,
+) -> str | None:
+    """Run command with timeout. Returns stdout on success, None on failure.
+
+    If stdin is given it is written to the command's standard input.
+    """
     try:
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        # stderr is never used, so don't pipe, read and decode it
+        r = subprocess.run(
+            cmd,
+            input=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=timeout,
+        )
         return r.stdout if r.returncode == 0 else None
     except (subprocess.TimeoutExpired, OSError):
         return None
 
 
+def _run_cmds(
+    pool: concurrent.futures.Executor,
+    cmds: list[list[str]],
+) -> list[str | None]:
+    """Run independent commands concurrently. Returns outputs in input order.
+
+    Per-device queries mostly wait on the device, so overlapping them makes a
+    poll cost about one query instead of one per device. The caller owns pool
+    so its threads are reused across polls.
+    """
+    if len(cmds) <= 1:
+        return [run_cmd(cmd) for cmd in cmds]
+    return list(pool.map(run_cmd, cmds))
+
+
+def _parse_gpu_temps(lines: list[str]) -> tuple[float, ...] | None:
+    """Parse one nvidia-smi temperature per line. None if any line is invalid."""
+    temps: list[float] = []
+    for line in lines:
+        try:
+            temp = _valid_temp(float(line.strip()))
+        except ValueError:
+            return None
+        if temp is None:
+            return None
+        temps.append(temp)
+    return tuple(temps) if temps else None
+
+
+def _hwmon_name(hwmon: pathlib.Path) -> str | None:
+    """Return the driver name of a hwmon directory, or None if unreadable."""
+    try:
+        return (hwmon / "name").read_text().strip()
+    except OSError:
+        return None
+
+
 def _valid_temp(value: float) -> float | None:
     """Return value if in valid range (0-120C), else None."""
     if 0 <= value <= 120:
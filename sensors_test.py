@@ -4,9 +4,14 @@
 
 from __future__ import annotations
 
+import concurrent.futures
+import os
 import pathlib
+import subprocess
 import tempfile
-from unittest.mock import patch
+import threading
+from collections.abc import Callable, Iterator
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -25,8 +30,12 @@ class TestRunCmd:
         assert result is None
 
     def test_timeout(self) -> None:
-        result = sensors.run_cmd(["sleep", "10"], timeout=0.1)
+        # Raise TimeoutExpired directly rather than waiting out a real sleep
+        timeout = subprocess.TimeoutExpired(["sleep", "10"], 0.1)
+        with patch.object(sensors.subprocess, "run", side_effect=timeout) as run:
+            result = sensors.run_cmd(["sleep", "10"], timeout=0.1)
         assert result is None
+        assert run.call_args.kwargs["timeout"] == 0.1
 
     def test_command_not_found(self) -> None:
         result = sensors.run_cmd(["nonexistent_command_12345"])
@@ -41,29 +50,79 @@ class TestRunCmd:
         assert result == "fast\n"
 
 
-class TestValidTemp:
-    """Tests for _valid_temp helper function."""
+class TestRunCmds:
+    """Tests for _run_cmds concurrent helper."""
+
+    @pytest.fixture
+    def pool(self) -> Iterator[concurrent.futures.ThreadPoolExecutor]:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            yield pool
+
+    def test_preserves_order(self, pool: concurrent.futures.Executor) -> None:
+        def mock_run_cmd(cmd: list[str]) -> str | None:
+            return None if cmd[1] == "bad" else cmd[1]
+
+        cmds = [["x", "a"], ["x", "bad"], ["x", "c"], ["x", "d"]]
+        with patch.object(sensors, "run_cmd", side_effect=mock_run_cmd):
+            result = sensors._run_cmds(pool, cmds)
+        assert result == ["a", None, "c", "d"]
 
-    def test_valid_in_range(self) -> None:
-        assert sensors._valid_temp(50.0) == 50.0
+    def test_runs_concurrently(self, pool: concurrent.futures.Executor) -> None:
+        barrier = threading.Barrier(3, timeout=5.0)
 
-    def test_valid_at_lower_boundary(self) -> None:
-        assert sensors._valid_temp(0.0) == 0.0
+        def mock_run_cmd(cmd: list[str]) -> str | None:
+            _ = barrier.wait()  # Deadlocks (times out) if run serially
+            return cmd[0]
+
+        with patch.object(sensors, "run_cmd", side_effect=mock_run_cmd):
+            result = sensors._run_cmds(pool, [["a"], ["b"], ["c"]])
+        assert result == ["a", "b", "c"]
+
+    def test_empty(self, pool: concurrent.futures.Executor) -> None:
+        assert sensors._run_cmds(pool, []) == []
+
+    def test_reuses_pool_threads(self) -> None:
+        sensor = sensors.Nvmecli()
+        sensor._devices = ("/dev/nvme0n1", "/dev/nvme1n1")
+        sensor._pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        threads: set[threading.Thread] = set()
 
-    def test_valid_at_upper_boundary(self) -> None:
-        assert sensors._valid_temp(120.0) == 120.0
+        def mock_run_cmd(cmd: list[str]) -> str | None:
+            threads.add(threading.current_thread())
+            return None
 
-    def test_invalid_below_range(self) -> None:
-        assert sensors._valid_temp(-0.1) is None
+        with patch.object(sensors, "run_cmd", side_effect=mock_run_cmd):
+            for _ in range(3):
+                _ = sensor.get()
+        sensor._pool.shutdown()
+        assert len(threads) <= 2
 
-    def test_invalid_above_range(self) -> None:
-        assert sensors._valid_temp(120.1) is None
 
-    def test_invalid_negative(self) -> None:
-        assert sensors._valid_temp(-50.0) is None
+class TestValidTemp:
+    """Tests for _valid_temp helper function."""
 
-    def test_invalid_extreme_high(self) -> None:
-        assert sensors._valid_temp(1000.0) is None
+    @pytest.mark.parametrize(
+        "value",
+        [
+            pytest.param(50.0, id="in_range"),
+            pytest.param(0.0, id="lower_boundary"),
+            pytest.param(120.0, id="upper_boundary"),
+        ],
+    )
+    def test_valid(self, value: float) -> None:
+        assert sensors._valid_temp(value) == value
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            pytest.param(-0.1, id="below_range"),
+            pytest.param(120.1, id="above_range"),
+            pytest.param(-50.0, id="negative"),
+            pytest.param(1000.0, id="extreme_high"),
+        ],
+    )
+    def test_invalid(self, value: float) -> None:
+        assert sensors._valid_temp(value) is None
 
 
 class TestK10Temp:
@@ -105,6 +164,19 @@ class TestK10Temp:
             assert 45.0 in result["cpu"]
             assert 50.0 in result["cpu"]
 
+    def test_get_globs_inputs_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            hwmon_path = pathlib.Path(tmpdir)
+            (hwmon_path / "temp1_input").write_text("45000\n")
+
+            sensor = sensors.K10Temp()
+            sensor._hwmon_path = hwmon_path
+            assert sensor.get() == {"cpu": (45.0,)}
+            (hwmon_path / "temp1_input").write_text("47000\n")
+            with patch.object(pathlib.Path, "glob") as mock_glob:
+                assert sensor.get() == {"cpu": (47.0,)}
+            mock_glob.assert_not_called()
+
     def test_get_handles_read_error(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             hwmon_path = pathlib.Path(tmpdir)
@@ -219,6 +291,328 @@ class TestNvidiasmi:
             )
 
 
+class TestNvidiasmiLoop:
+    """Tests for NvidiasmiLoop streaming GPU sensor."""
+
+    @pytest.fixture
+    def pipe(self) -> Iterator[tuple[MagicMock, int]]:
+        """Fake nvidia-smi child whose stdout is a real pipe; yields write fd."""
+        procs: list[tuple[MagicMock, int]] = []
+
+        def make_proc() -> MagicMock:
+            r, w = os.pipe()
+            proc = MagicMock()
+            proc.stdout = os.fdopen(r, "rb")
+            proc.poll.return_value = None
+            procs.append((proc, w))
+            return proc
+
+        proc = make_proc()
+        proc.respawn = make_proc  # Fresh child for restart tests
+        yield proc, procs[0][1]
+        for p, w in procs:
+            p.stdout.close()
+            try:
+                os.close(w)
+            except OSError:
+                pass  # Closed by the test
+
+    def test_streams_latest_sample(self, pipe: tuple[MagicMock, int]) -> None:
+        proc, w = pipe
+        sensor = sensors.NvidiasmiLoop(period_ms=500)
+        with (
+            patch.object(sensors, "run_cmd", return_value="60\n61\n") as mock_run,
+            patch.object(sensors.subprocess, "Popen", return_value=proc) as popen,
+        ):
+            assert sensor.get() == {"gpu": (60.0, 61.0)}  # One-shot, starts child
+            assert "--loop-ms=500" in popen.call_args.args[0]
+
+            _ = os.write(w, b"0, 65\n1, 70\n0, 66\n")
+            assert sensor.get() == {"gpu": (65.0, 70.0)}
+            _ = os.write(w, b"1, 71\n0, 67\n1, 7")
+            assert sensor.get() == {"gpu": (66.0, 71.0)}
+            _ = os.write(w, b"2\n")
+            assert sensor.get() == {"gpu": (67.0, 72.0)}
+        assert mock_run.call_count == 1
+        assert popen.call_count == 1
+
+    def test_stray_line_does_not_shift_samples(
+        self, pipe: tuple[MagicMock, int]
+    ) -> None:
+        proc, w = pipe
+        sensor = sensors.NvidiasmiLoop()
+        with (
+            patch.object(sensors, "run_cmd", return_value="60\n61\n"),
+            patch.object(sensors.subprocess, "Popen", return_value=proc),
+        ):
+            _ = sensor.get()
+            _ = os.write(w, b"0, 65\nUnable to determine the device handle\n1, 70\n")
+            assert sensor.get() == {"gpu": (65.0, 70.0)}
+            _ = os.write(w, b"0, 66\n1, 71\n")
+            assert sensor.get() == {"gpu": (66.0, 71.0)}
+
+    def test_no_new_data_reuses_last(self, pipe: tuple[MagicMock, int]) -> None:
+        proc, _ = pipe
+        sensor = sensors.NvidiasmiLoop()
+        with (
+            patch.object(sensors, "run_cmd", return_value="60\n") as mock_run,
+            patch.object(sensors.subprocess, "Popen", return_value=proc),
+            patch.object(sensors.time, "monotonic", return_value=100.0),
+        ):
+            _ = sensor.get()
+            assert sensor.get() == {"gpu": (60.0,)}
+        assert mock_run.call_count == 1
+
+    def test_stale_stream_restarts(self, pipe: tuple[MagicMock, int]) -> None:
+        proc, _ = pipe
+        sensor = sensors.NvidiasmiLoop(period_ms=1000)
+        with (
+            patch.object(sensors, "run_cmd", return_value="60\n") as mock_run,
+            patch.object(
+                sensors.subprocess, "Popen", side_effect=[proc, proc.respawn()]
+            ) as popen,
+            patch.object(sensors.time, "monotonic", side_effect=[100.0, 110.0]),
+        ):
+            _ = sensor.get()
+            _ = sensor.get()
+        assert mock_run.call_count == 2
+        assert popen.call_count == 2
+        proc.kill.assert_called_once()
+
+    def test_eof_restarts(self, pipe: tuple[MagicMock, int]) -> None:
+        proc, w = pipe
+        sensor = sensors.NvidiasmiLoop()
+        with (
+            patch.object(sensors, "run_cmd", return_value="60\n") as mock_run,
+            patch.object(
+                sensors.subprocess, "Popen", side_effect=[proc, proc.respawn()]
+            ),
+        ):
+            _ = sensor.get()
+            os.close(w)
+            assert sensor.get() == {"gpu": (60.0,)}
+        assert mock_run.call_count == 2
+        proc.kill.assert_called_once()
+
+    def test_no_gpus_does_not_start(self) -> None:
+        sensor = sensors.NvidiasmiLoop()
+        with (
+            patch.object(sensors, "run_cmd", return_value=None),
+            patch.object(sensors.subprocess, "Popen") as popen,
+        ):
+            assert sensor.get() == {"gpu": None}
+        popen.assert_not_called()
+
+    def test_popen_failure_uses_oneshot(self) -> None:
+        sensor = sensors.NvidiasmiLoop()
+        with (
+            patch.object(sensors, "run_cmd", return_value="60\n") as mock_run,
+            patch.object(sensors.subprocess, "Popen", side_effect=OSError),
+        ):
+            assert sensor.get() == {"gpu": (60.0,)}
+            assert sensor.get() == {"gpu": (60.0,)}
+        assert mock_run.call_count == 2
+
+    def test_gpu_sensor_loop(self) -> None:
+        with (
+            patch.object(sensors, "pynvml", None),
+            patch.object(pathlib.Path, "glob", return_value=[]),  # No amdgpu
+        ):
+            assert isinstance(sensors.gpu_sensor(1000), sensors.NvidiasmiLoop)
+
+
+class TestNvml:
+    """Tests for Nvml GPU sensor and gpu_sensor() selection."""
+
+    class NVMLError(Exception):
+        pass
+
+    @pytest.fixture
+    def nvml(self) -> MagicMock:
+        nvml = MagicMock()
+        nvml.NVMLError = self.NVMLError
+        nvml.nvmlDeviceGetCount.return_value = 2
+        nvml.nvmlDeviceGetHandleByIndex.side_effect = lambda i: f"handle{i}"
+        return nvml
+
+    def test_get_temps(self, nvml: MagicMock) -> None:
+        nvml.nvmlDeviceGetTemperature.side_effect = [65, 70]
+        with patch.object(sensors, "pynvml", nvml):
+            sensor = sensors.Nvml()
+            result = sensor.get()
+        assert result == {"gpu": (65.0, 70.0)}
+        nvml.nvmlInit.assert_called_once()
+        nvml.nvmlDeviceGetTemperature.assert_any_call(
+            "handle1", nvml.NVML_TEMPERATURE_GPU
+        )
+
+    def test_get_handles_cached(self, nvml: MagicMock) -> None:
+        nvml.nvmlDeviceGetTemperature.return_value = 50
+        with patch.object(sensors, "pynvml", nvml):
+            sensor = sensors.Nvml()
+            _ = sensor.get()
+            _ = sensor.get()
+        nvml.nvmlInit.assert_called_once()
+        assert nvml.nvmlDeviceGetHandleByIndex.call_count == 2
+
+    def test_get_nvml_error(self, nvml: MagicMock) -> None:
+        nvml.nvmlDeviceGetTemperature.side_effect = self.NVMLError("gone")
+        with patch.object(sensors, "pynvml", nvml):
+            result = sensors.Nvml().get()
+        assert result == {"gpu": None}
+
+    def test_get_out_of_range(self, nvml: MagicMock) -> None:
+        nvml.nvmlDeviceGetTemperature.side_effect = [65, 150]
+        with patch.object(sensors, "pynvml", nvml):
+            result = sensors.Nvml().get()
+        assert result == {"gpu": None}
+
+    def test_get_no_gpus(self, nvml: MagicMock) -> None:
+        nvml.nvmlDeviceGetCount.return_value = 0
+        with patch.object(sensors, "pynvml", nvml):
+            result = sensors.Nvml().get()
+        assert result == {"gpu": None}
+
+    def test_gpu_sensor_prefers_nvml(self, nvml: MagicMock) -> None:
+        with patch.object(sensors, "pynvml", nvml):
+            assert isinstance(sensors.gpu_sensor(), sensors.Nvml)
+
+    def test_gpu_sensor_without_pynvml(self) -> None:
+        with (
+            patch.object(sensors, "pynvml", None),
+            patch.object(pathlib.Path, "glob", return_value=[]),  # No amdgpu
+        ):
+            assert isinstance(sensors.gpu_sensor(), sensors.Nvidiasmi)
+
+    def test_gpu_sensor_nvml_init_fails(
+        self, nvml: MagicMock, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        nvml.nvmlInit.side_effect = self.NVMLError("no driver")
+        with (
+            patch.object(sensors, "pynvml", nvml),
+            patch.object(pathlib.Path, "glob", return_value=[]),  # No amdgpu
+        ):
+            assert isinstance(sensors.gpu_sensor(), sensors.Nvidiasmi)
+        assert "NVML unavailable (no driver), using nvidia-smi" in caplog.text
+
+
+class TestAmdgpu:
+    """Tests for Amdgpu GPU sensor."""
+
+    def _card(
+        self, root: pathlib.Path, card: int, temp: str, name: str = "amdgpu"
+    ) -> pathlib.Path:
+        hwmon = root / f"card{card}" / "device" / "hwmon" / f"hwmon{card + 3}"
+        hwmon.mkdir(parents=True)
+        (hwmon / "name").write_text(f"{name}\n")
+        temp_input = hwmon / "temp1_input"
+        temp_input.write_text(temp)
+        return temp_input
+
+    def test_get_reads_temps(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = pathlib.Path(tmpdir)
+            inputs = [self._card(root, 1, "61000\n"), self._card(root, 0, "55500\n")]
+            with patch.object(pathlib.Path, "glob", return_value=inputs):
+                sensor = sensors.Amdgpu()
+            assert sensor.get() == {"gpu": (55.5, 61.0)}  # Sorted by card
+
+    def test_get_no_cards(self) -> None:
+        with patch.object(pathlib.Path, "glob", return_value=[]):
+            sensor = sensors.Amdgpu()
+        assert sensor.get() == {"gpu": None}
+
+    def test_get_invalid_temp(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = pathlib.Path(tmpdir)
+            inputs = [self._card(root, 0, "55000\n"), self._card(root, 1, "bad\n")]
+            with patch.object(pathlib.Path, "glob", return_value=inputs):
+                sensor = sensors.Amdgpu()
+            assert sensor.get() == {"gpu": None}
+
+    def test_get_skips_other_drivers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = pathlib.Path(tmpdir)
+            inputs = [
+                self._card(root, 0, "55000\n"),
+                self._card(root, 1, "40000\n", name="nouveau"),
+            ]
+            with patch.object(pathlib.Path, "glob", return_value=inputs):
+                sensor = sensors.Amdgpu()
+            assert sensor.get() == {"gpu": (55.0,)}
+
+    def test_found(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inputs = [self._card(pathlib.Path(tmpdir), 0, "55000\n")]
+            with patch.object(pathlib.Path, "glob", return_value=inputs):
+                assert sensors.Amdgpu().found
+        with patch.object(pathlib.Path, "glob", return_value=[]):
+            assert not sensors.Amdgpu().found
+
+    def test_gpu_sensor_prefers_amdgpu_over_nvidia_smi(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inputs = [self._card(pathlib.Path(tmpdir), 0, "55000\n")]
+            with (
+                patch.object(sensors, "pynvml", None),
+                patch.object(pathlib.Path, "glob", return_value=inputs),
+                patch.object(sensors.shutil, "which", return_value=None),
+            ):
+                assert isinstance(sensors.gpu_sensor(), sensors.Amdgpu)
+        assert "NVIDIA" not in caplog.text
+
+    def test_gpu_sensor_amdgpu_warns_if_nvidia_smi_present(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inputs = [self._card(pathlib.Path(tmpdir), 0, "55000\n")]
+            with (
+                patch.object(sensors, "pynvml", None),
+                patch.object(pathlib.Path, "glob", return_value=inputs),
+                patch.object(sensors.shutil, "which", return_value="/nvidia-smi"),
+            ):
+                assert isinstance(sensors.gpu_sensor(), sensors.Amdgpu)
+        assert "NVIDIA GPUs are not monitored" in caplog.text
+
+    def test_gpu_sensor_nvml_failure_names_amdgpu(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        class NVMLError(Exception):
+            pass
+
+        nvml = MagicMock()
+        nvml.NVMLError = NVMLError
+        nvml.nvmlInit.side_effect = NVMLError("no driver")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inputs = [self._card(pathlib.Path(tmpdir), 0, "55000\n")]
+            with (
+                patch.object(sensors, "pynvml", nvml),
+                patch.object(pathlib.Path, "glob", return_value=inputs),
+                patch.object(sensors.shutil, "which", return_value=None),
+            ):
+                assert isinstance(sensors.gpu_sensor(), sensors.Amdgpu)
+        assert "using amdgpu hwmon" in caplog.text
+        assert "using nvidia-smi" not in caplog.text
+
+    def test_gpu_sensor_ignores_non_amdgpu_cards(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = pathlib.Path(tmpdir)
+            inputs = [self._card(root, 0, "40000\n", name="nouveau")]
+            with (
+                patch.object(sensors, "pynvml", None),
+                patch.object(pathlib.Path, "glob", return_value=inputs),
+            ):
+                assert isinstance(sensors.gpu_sensor(), sensors.Nvidiasmi)
+
+    def test_gpu_sensor_no_amdgpu(self) -> None:
+        with (
+            patch.object(sensors, "pynvml", None),
+            patch.object(pathlib.Path, "glob", return_value=[]),
+        ):
+            assert isinstance(sensors.gpu_sensor(), sensors.Nvidiasmi)
+
+
 class TestSmartctl:
     """Tests for Smartctl HDD sensor."""
 
@@ -444,6 +838,15 @@ Temperature Sensor 2                    : 50 C
             result = sensor.get()
         assert result == {"nvme": (42.0,)}
 
+    def test_get_skips_invalid_temp_line(self, sensor: sensors.Nvmecli) -> None:
+        sensor._devices = ("/dev/nvme0n1",)
+        nvme_out = """temperature                             : 150 C
+Temperature Sensor 1                    : 45 C
+"""
+        with patch.object(sensors, "run_cmd", return_value=nvme_out):
+            result = sensor.get()
+        assert result == {"nvme": (45.0,)}
+
     def test_get_calls_nvme_correctly(self, sensor: sensors.Nvmecli) -> None:
         sensor._devices = ("/dev/nvme0n1",)
         nvme_out = """temperature                             : 42 C
@@ -471,11 +874,11 @@ class TestIpmitool:
         return sensors.Ipmitool(sensor_map)
 
     def test_get_all_sensors(self, sensor: sensors.Ipmitool) -> None:
-        ipmi_out = """CPU Temp         | 45.000     | degrees C  | ok
-DIMMA~F Temp     | 26.000     | degrees C  | ok
-DIMMG~L Temp     | 28.000     | degrees C  | ok
-GPU1 Temp        | 65.000     | degrees C  | ok
-GPU2 Temp        | 70.000     | degrees C  | ok
+        ipmi_out = """CPU Temp         | 01h | ok  |  3.1 | 45 degrees C
+DIMMA~F Temp     | 01h | ok  |  3.1 | 26 degrees C
+DIMMG~L Temp     | 01h | ok  |  3.1 | 28 degrees C
+GPU1 Temp        | 01h | ok  |  3.1 | 65 degrees C
+GPU2 Temp        | 01h | ok  |  3.1 | 70 degrees C
 """
         with patch.object(sensors, "run_cmd", return_value=ipmi_out):
             result = sensor.get()
@@ -489,7 +892,7 @@ GPU2 Temp        | 70.000     | degrees C  | ok
         assert result == {"cpu": None, "ram": None, "gpu": None}
 
     def test_get_partial_sensors(self, sensor: sensors.Ipmitool) -> None:
-        ipmi_out = """CPU Temp         | 45.000     | degrees C  | ok
+        ipmi_out = """CPU Temp         | 01h | ok  |  3.1 | 45 degrees C
 """
         with patch.object(sensors, "run_cmd", return_value=ipmi_out):
             result = sensor.get()
@@ -498,8 +901,8 @@ GPU2 Temp        | 70.000     | degrees C  | ok
         assert result["gpu"] is None
 
     def test_get_non_numeric_value(self, sensor: sensors.Ipmitool) -> None:
-        ipmi_out = """CPU Temp         | na         | degrees C  | na
-DIMMA~F Temp     | 26.000     | degrees C  | ok
+        ipmi_out = """CPU Temp         | 01h | ns  |  3.1 | No Reading
+DIMMA~F Temp     | 01h | ok  |  3.1 | 26 degrees C
 """
         with patch.object(sensors, "run_cmd", return_value=ipmi_out):
             result = sensor.get()
@@ -507,9 +910,9 @@ DIMMA~F Temp     | 26.000     | degrees C  | ok
         assert result["ram"] == (26.0,)
 
     def test_get_short_line(self, sensor: sensors.Ipmitool) -> None:
-        ipmi_out = """CPU Temp         | 45.000     | degrees C  | ok
+        ipmi_out = """CPU Temp         | 01h | ok  |  3.1 | 45 degrees C
 Short
-DIMMA~F Temp     | 26.000     | degrees C  | ok
+DIMMA~F Temp     | 01h | ok  |  3.1 | 26 degrees C
 """
         with patch.object(sensors, "run_cmd", return_value=ipmi_out):
             result = sensor.get()
@@ -517,9 +920,9 @@ DIMMA~F Temp     | 26.000     | degrees C  | ok
         assert result["ram"] == (26.0,)
 
     def test_get_unknown_sensor_ignored(self, sensor: sensors.Ipmitool) -> None:
-        ipmi_out = """CPU Temp         | 45.000     | degrees C  | ok
-Unknown Sensor   | 99.000     | degrees C  | ok
-DIMMA~F Temp     | 26.000     | degrees C  | ok
+        ipmi_out = """CPU Temp         | 01h | ok  |  3.1 | 45 degrees C
+Unknown Sensor   | 01h | ok  |  3.1 | 99 degrees C
+DIMMA~F Temp     | 01h | ok  |  3.1 | 26 degrees C
 """
         with patch.object(sensors, "run_cmd", return_value=ipmi_out):
             result = sensor.get()
@@ -528,7 +931,7 @@ DIMMA~F Temp     | 26.000     | degrees C  | ok
         assert "unknown" not in result
 
     def test_get_out_of_range_temp(self, sensor: sensors.Ipmitool) -> None:
-        ipmi_out = """CPU Temp         | 150.000    | degrees C  | ok
+        ipmi_out = """CPU Temp         | 01h | ok  |  3.1 | 150 degrees C
 """
         with patch.object(sensors, "run_cmd", return_value=ipmi_out):
             result = sensor.get()
@@ -542,9 +945,9 @@ DIMMA~F Temp     | 26.000     | degrees C  | ok
                 "VRM2 Temp": "vrm",
             }
         )
-        ipmi_out = """VRM0 Temp        | 40.000     | degrees C  | ok
-VRM1 Temp        | 42.000     | degrees C  | ok
-VRM2 Temp        | 44.000     | degrees C  | ok
+        ipmi_out = """VRM0 Temp        | 01h | ok  |  3.1 | 40 degrees C
+VRM1 Temp        | 01h | ok  |  3.1 | 42 degrees C
+VRM2 Temp        | 01h | ok  |  3.1 | 44 degrees C
 """
         with patch.object(sensors, "run_cmd", return_value=ipmi_out):
             result = sensor.get()
@@ -552,73 +955,49 @@ VRM2 Temp        | 44.000     | degrees C  | ok
 
     def test_get_empty_sensor_map(self) -> None:
         sensor = sensors.Ipmitool({})
-        ipmi_out = """CPU Temp         | 45.000     | degrees C  | ok
+        ipmi_out = """CPU Temp         | 01h | ok  |  3.1 | 45 degrees C
 """
         with patch.object(sensors, "run_cmd", return_value=ipmi_out):
             result = sensor.get()
         assert result == {}
 
     def test_get_whitespace_handling(self, sensor: sensors.Ipmitool) -> None:
-        ipmi_out = """  CPU Temp       | 45.000     | degrees C  | ok
+        ipmi_out = """  CPU Temp       | 01h | ok  |  3.1 | 45 degrees C
 """
         with patch.object(sensors, "run_cmd", return_value=ipmi_out):
             result = sensor.get()
         assert result["cpu"] == (45.0,)
 
     def test_get_calls_ipmitool_correctly(self, sensor: sensors.Ipmitool) -> None:
-        ipmi_out = """CPU Temp         | 45.000     | degrees C  | ok
+        ipmi_out = """CPU Temp         | 01h | ok  |  3.1 | 45 degrees C
 """
         with patch.object(sensors, "run_cmd", return_value=ipmi_out) as mock:
             _ = sensor.get()
-            mock.assert_called_once_with(["ipmitool", "sensor"])
+            mock.assert_called_once_with(["ipmitool", "sdr", "type", "temperature"])
 
 
 class TestSensorProtocol:
     """Tests verifying sensors implement the Sensor protocol."""
 
-    def test_k10temp_has_get(self) -> None:
-        with patch.object(pathlib.Path, "iterdir", return_value=[]):
-            sensor = sensors.K10Temp()
-        assert hasattr(sensor, "get")
-        assert callable(sensor.get)
-
-    def test_nvidiasmi_has_get(self) -> None:
-        sensor = sensors.Nvidiasmi()
-        assert hasattr(sensor, "get")
-        assert callable(sensor.get)
-
-    def test_smartctl_has_get(self) -> None:
-        with patch.object(pathlib.Path, "iterdir", return_value=[]):
-            sensor = sensors.Smartctl()
-        assert hasattr(sensor, "get")
-        assert callable(sensor.get)
-
-    def test_nvmecli_has_get(self) -> None:
-        with patch.object(pathlib.Path, "glob", return_value=[]):
-            sensor = sensors.Nvmecli()
-        assert hasattr(sensor, "get")
-        assert callable(sensor.get)
-
-    def test_ipmitool_has_get(self) -> None:
-        sensor = sensors.Ipmitool({})
-        assert hasattr(sensor, "get")
+    @pytest.mark.parametrize(
+        "factory",
+        [
+            pytest.param(sensors.K10Temp, id="k10temp"),
+            pytest.param(sensors.Nvidiasmi, id="nvidiasmi"),
+            pytest.param(sensors.NvidiasmiLoop, id="nvidiasmi_loop"),
+            pytest.param(sensors.Amdgpu, id="amdgpu"),
+            pytest.param(sensors.Smartctl, id="smartctl"),
+            pytest.param(sensors.Nvmecli, id="nvmecli"),
+            pytest.param(lambda: sensors.Ipmitool({}), id="ipmitool"),
+        ],
+    )
+    def test_get_returns_dict(self, factory: Callable[[], sensors.Sensor]) -> None:
+        # No devices detected and every command fails
+        with (
+            patch.object(pathlib.Path, "iterdir", return_value=[]),
+            patch.object(pathlib.Path, "glob", return_value=[]),
+        ):
+            sensor = factory()
         assert callable(sensor.get)
-
-    def test_all_sensors_return_dict(self) -> None:
-        with patch.object(pathlib.Path, "iterdir", return_value=[]):
-            k10 = sensors.K10Temp()
-        assert isinstance(k10.get(), dict)
-
-        with patch.object(sensors, "run_cmd", return_value=None):
-            assert isinstance(sensors.Nvidiasmi().get(), dict)
-
-        with patch.object(pathlib.Path, "iterdir", return_value=[]):
-            smartctl = sensors.Smartctl()
-        assert isinstance(smartctl.get(), dict)
-
-        with patch.object(pathlib.Path, "glob", return_value=[]):
-            nvmecli = sensors.Nvmecli()
-        assert isinstance(nvmecli.get(), dict)
-
         with patch.object(sensors, "run_cmd", return_value=None):
-            assert isinstance(sensors.Ipmitool({}).get(), dict)
+            assert isinstance(sensor.get(), dict)